@@ -2,7 +2,6 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from extractor import router as keyword_router
 from reddit_router import router as reddit_router
-from quora_test.quora_scrapper import scrape_quora
 from quora_router import router as quora_router
 
 
@@ -1,7 +1,5 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
-from keybert import KeyBERT
-from sklearn.feature_extraction.text import TfidfVectorizer
 import re
 from typing import Optional, List
 
@@ -12,6 +10,10 @@ kw_model = None
 def get_model():
     global kw_model
     if kw_model is None:
+        # keybert / sklearn are only imported once a model is actually needed
+        from keybert import KeyBERT
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
         vectorizer = TfidfVectorizer(
             stop_words="english",
             ngram_range=(1, 2),
@@ -21,6 +23,10 @@ def get_model():
     return kw_model
 
 
+def is_model_loaded():
+    return kw_model is not None
+
+
 class KeywordInput(BaseModel):
     # onboarding / form based
     industry: Optional[str] = ""
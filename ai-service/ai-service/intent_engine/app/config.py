@@ -3,4 +3,125 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-SERPER_API_KEY = os.getenv("SERPER_API_KEY")
\ No newline at end of file
+SERPER_API_KEY = os.getenv("SERPER_API_KEY")
+
+# =========================
+# ADMIN API
+# =========================
+
+# /intent/admin/* requires this value in the X-Admin-Token header; with no
+# token set the admin routes are disabled
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# =========================
+# SEARCH PIPELINE
+# =========================
+
+# Workers per stage of the /intent/search pipeline
+PIPELINE_SEARCH_CONCURRENCY = int(os.getenv("PIPELINE_SEARCH_CONCURRENCY", "4"))
+PIPELINE_FETCH_CONCURRENCY = int(os.getenv("PIPELINE_FETCH_CONCURRENCY", "8"))
+PIPELINE_SCORE_CONCURRENCY = int(os.getenv("PIPELINE_SCORE_CONCURRENCY", "2"))
+
+# Max items waiting between two stages (backpressure)
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "16"))
+
+# Scored together in one model call; a worker waits up to the linger time
+# for a batch to fill before scoring what it has
+PIPELINE_SCORE_BATCH_SIZE = int(os.getenv("PIPELINE_SCORE_BATCH_SIZE", "16"))
+PIPELINE_SCORE_LINGER_MS = int(os.getenv("PIPELINE_SCORE_LINGER_MS", "50"))
+
+# Scored leads written per upsert (the whole search usually fits in one)
+PIPELINE_STORE_BATCH_SIZE = int(os.getenv("PIPELINE_STORE_BATCH_SIZE", "100"))
+
+# Leads whose title+snippet word sets overlap at least this much (Jaccard,
+# estimated with MinHash) are treated as copies of each other
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+
+# =========================
+# IMRE SCORING
+# =========================
+
+# Title/snippet phrases that count as an expansion or buying signal
+IMRE_EXPANSION_KEYWORDS = [
+    keyword.strip()
+    for keyword in os.getenv(
+        "IMRE_EXPANSION_KEYWORDS",
+        "rfp,tender,supplier search,vendor registration,expansion,new plant,procurement"
+    ).split(",")
+    if keyword.strip()
+]
+
+IMRE_WEIGHTS = {
+    "intent": float(os.getenv("IMRE_WEIGHT_INTENT", "0.6")),
+    "match": float(os.getenv("IMRE_WEIGHT_MATCH", "0.2")),
+    "recency": float(os.getenv("IMRE_WEIGHT_RECENCY", "0.1")),
+    "expansion": float(os.getenv("IMRE_WEIGHT_EXPANSION", "0.1")),
+}
+
+# Leads carry no date yet, so every one gets this neutral recency score
+IMRE_RECENCY_SCORE = float(os.getenv("IMRE_RECENCY_SCORE", "50"))
+
+# =========================
+# PAGE FETCHER
+# =========================
+
+FETCH_TIMEOUT_SECONDS = float(os.getenv("FETCH_TIMEOUT_SECONDS", "10"))
+
+# Stop reading a page after this many bytes / this much extracted text
+FETCH_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", str(512 * 1024)))
+FETCH_MAX_TEXT_CHARS = int(os.getenv("FETCH_MAX_TEXT_CHARS", "5000"))
+
+# Keep-alive pool: hosts kept open, and connections allowed per host
+FETCH_POOL_HOSTS = int(os.getenv("FETCH_POOL_HOSTS", "64"))
+FETCH_PER_HOST_CONNECTIONS = int(os.getenv("FETCH_PER_HOST_CONNECTIONS", "4"))
+
+# =========================
+# LOCAL CACHES
+# =========================
+
+# ai-service/.cache unless overridden
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(__file__), "..", "..", ".cache"))
+
+# Extracted page text, revalidated with the origin once older than the TTL
+PAGE_CACHE_PATH = os.getenv("PAGE_CACHE_PATH", os.path.join(CACHE_DIR, "pages.sqlite3"))
+PAGE_CACHE_TTL_SECONDS = int(os.getenv("PAGE_CACHE_TTL_SECONDS", str(6 * 3600)))
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# A hit only rewrites accessed_at when the stored value is older than this,
+# so repeat hits on a hot page do not each take the write lock
+PAGE_CACHE_TOUCH_SECONDS = int(os.getenv("PAGE_CACHE_TOUCH_SECONDS", "60"))
+
+# Serper responses, shared by every customer searching the same query
+SERP_CACHE_PATH = os.getenv("SERP_CACHE_PATH", os.path.join(CACHE_DIR, "serp.sqlite3"))
+SERP_CACHE_TTL_SECONDS = int(os.getenv("SERP_CACHE_TTL_SECONDS", str(12 * 3600)))
+
+# Document embeddings by content hash: an in-memory LRU in front of a disk file
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(CACHE_DIR, "embeddings.sqlite3"))
+EMBEDDING_CACHE_MEMORY_ITEMS = int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS", "5000"))
+
+# Rows kept in the disk tier (~1 KB each at 384 dims); least recently used
+# rows are evicted beyond this
+EMBEDDING_CACHE_MAX_ROWS = int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", "200000"))
+
+# =========================
+# INTENT MODEL
+# =========================
+
+INTENT_MODEL_NAME = os.getenv("INTENT_MODEL_NAME", "all-MiniLM-L6-v2")
+
+# Embedding runtime: "torch" (PyTorch), "onnx" (ONNX Runtime, fp32) or
+# "onnx-int8" (ONNX Runtime with dynamic int8 quantization). Check a switch
+# with `python -m intent_engine.app.scripts.embedding_parity` first.
+INTENT_EMBEDDING_BACKEND = os.getenv("INTENT_EMBEDDING_BACKEND", "torch")
+
+# Instruction set the int8 model is quantized for: avx2, avx512, avx512_vnni or arm64
+INTENT_ONNX_QUANTIZATION = os.getenv("INTENT_ONNX_QUANTIZATION", "avx2")
+
+# Exported/quantized ONNX models are written here once and reused
+INTENT_ONNX_DIR = os.getenv("INTENT_ONNX_DIR", os.path.join(CACHE_DIR, "onnx"))
+
+# Documents per model.encode call when scoring a batch
+INTENT_ENCODE_BATCH_SIZE = int(os.getenv("INTENT_ENCODE_BATCH_SIZE", "32"))
+
+# Intent examples are searched in memory; the table is re-read this often
+INTENT_EXAMPLES_TABLE = os.getenv("INTENT_EXAMPLES_TABLE", "intent_examples")
+INTENT_INDEX_REFRESH_SECONDS = int(os.getenv("INTENT_INDEX_REFRESH_SECONDS", "900"))
@@ -0,0 +1,58 @@
+import hmac
+from fastapi import APIRouter, Depends, Header, HTTPException
+from intent_engine.app.config import ADMIN_TOKEN
+from intent_engine.app.services import intent_index_service
+from intent_engine.app.services import page_cache_service
+from intent_engine.app.services import serp_cache_service
+from intent_engine.app.services import embedding_cache_service
+from reddit_test.ai import reply_cache
+from reddit_test.ai import style_context
+import pg_pool
+import model_router
+
+
+def require_admin(x_admin_token: str = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API disabled (ADMIN_TOKEN not set)")
+
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/intent-index")
+def intent_index_status():
+    return intent_index_service.status()
+
+
+@router.post("/intent-index/refresh")
+def refresh_intent_index():
+    try:
+        intent_index_service.refresh()
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Intent index refresh failed: {exc}")
+
+    return intent_index_service.status()
+
+
+@router.get("/caches")
+def cache_stats():
+    return {
+        "pages": page_cache_service.stats(),
+        "serp": serp_cache_service.stats(),
+        "embeddings": embedding_cache_service.stats(),
+        "replies": reply_cache.stats(),
+        "style_context": style_context.stats(),
+    }
+
+
+@router.get("/db-pool")
+def db_pool_stats():
+    return pg_pool.stats()
+
+
+@router.get("/llm-routing")
+def llm_routing_stats():
+    return model_router.stats()
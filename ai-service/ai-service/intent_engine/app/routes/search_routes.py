@@ -1,15 +1,14 @@
 import time
+import json
+import asyncio
 import logging
 from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from intent_engine.app.services.keyword_expander import expand_keywords
-from intent_engine.app.services.intent_service import analyze_intent
-from intent_engine.app.services.search_service import search_web
-from intent_engine.app.services.scraper_service import scrape_content
-from intent_engine.app.services.imre_service import calculate_imre
 from intent_engine.app.services.dedup_service import deduplicate_leads
-from intent_engine.app.services.lead_storage_service import save_lead
-from intent_engine.app.services.lead_storage_service import lead_exists
+from intent_engine.app.services.dedup_service import DuplicateFilter
+from intent_engine.app.services.pipeline_service import run_search_pipeline
 
 
 router = APIRouter(prefix="/search", tags=["Search"])
@@ -24,120 +23,161 @@ class SearchRequest(BaseModel):
     buying_signals: str
 
 
+def validate_request(request: SearchRequest):
+    if not request.industry or not request.buying_signals:
+        raise HTTPException(status_code=400, detail="industry and buying_signals are required")
+
+
+def log_completion(stats, processing_time):
+    logger.info(
+        f"Search completed | Results: {stats['total_results_found']} | "
+        f"New: {stats['new_leads_processed']} | Skipped: {stats['skipped_existing']} | "
+        f"High: {stats['high_intent']} | Medium: {stats['medium_intent']} | "
+        f"Low: {stats['low_intent']} | Time: {processing_time}s"
+    )
+
+
+async def run_search(request: SearchRequest, min_intent: int = 0, on_lead=None):
+    """Full search for one request; also used by the background job runner."""
+    start_time = time.time()
+
+    expanded_keywords = expand_keywords(
+        request.industry,
+        request.buying_signals
+    )
+
+    all_results, stats = await run_search_pipeline(expanded_keywords, on_lead=on_lead)
+
+    all_results = deduplicate_leads(all_results)
+
+    all_results = sorted(
+        all_results,
+        key=lambda x: x.get("imre_score", 0),
+        reverse=True
+    )
+
+    if min_intent > 0:
+        all_results = [
+            lead for lead in all_results
+            if lead["intent_analysis"].get("intent_score", 0) >= min_intent
+        ]
+
+    end_time = time.time()
+    processing_time = round(end_time - start_time, 2)
+
+    log_completion(stats, processing_time)
+
+    return {
+        "processing_time_seconds": processing_time,
+        "stats": {
+            "total_keywords": len(expanded_keywords),
+            **stats
+        },
+        "keywords_used": expanded_keywords,
+        "leads": all_results
+    }
+
+
 @router.post("/")
-def search_leads(
+async def search_leads(
     request: SearchRequest,
     min_intent: int = Query(0)
 ):
+    validate_request(request)
+
+    try:
+        return await run_search(request, min_intent)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        logger.exception("Unhandled /intent/search failure: %s", exc)
+        raise HTTPException(status_code=500, detail="Search failed inside AI service")
+
+
+# =========================
+# STREAMING VARIANT
+# =========================
+
+def _ndjson_frame(event, data):
+    return json.dumps({"type": event, **data}, default=str) + "\n"
+
+
+def _sse_frame(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/stream")
+async def stream_search_leads(
+    request: SearchRequest,
+    min_intent: int = Query(0),
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$")
+):
+    """
+    Same search as POST /search/, but each lead is sent the moment it is
+    scored, followed by one closing "stats" frame.
+
+    NDJSON lines look like {"type": "lead", "lead": {...}}; with
+    format=sse the same payloads arrive as `lead` / `stats` events.
+    """
     start_time = time.time()
 
-    if not request.industry or not request.buying_signals:
-        raise HTTPException(status_code=400, detail="industry and buying_signals are required")
+    validate_request(request)
 
-    try:
-        expanded_keywords = expand_keywords(
-            request.industry,
-            request.buying_signals
-        )
+    expanded_keywords = expand_keywords(
+        request.industry,
+        request.buying_signals
+    )
 
-        all_results = []
+    frame = _sse_frame if format == "sse" else _ndjson_frame
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
 
-        total_results_found = 0
-        new_leads_processed = 0
-        skipped_existing = 0
+    async def events():
+        outbox = asyncio.Queue()
+        duplicates = DuplicateFilter()
 
-        high_intent = 0
-        medium_intent = 0
-        low_intent = 0
-        no_intent = 0
+        async def on_lead(lead):
+            # Same rules as deduplicate_leads (canonical URL, title,
+            # MinHash), applied in arrival order rather than result order
+            if duplicates.is_duplicate(lead):
+                return
 
-        for keyword in expanded_keywords:
+            if lead["intent_analysis"].get("intent_score", 0) >= min_intent:
+                await outbox.put(("lead", {"lead": lead}))
+
+        async def run():
             try:
-                results = search_web(keyword)
+                _, stats = await run_search_pipeline(expanded_keywords, on_lead=on_lead)
+
+                processing_time = round(time.time() - start_time, 2)
+                log_completion(stats, processing_time)
+
+                await outbox.put(("stats", {
+                    "processing_time_seconds": processing_time,
+                    "stats": {
+                        "total_keywords": len(expanded_keywords),
+                        **stats
+                    },
+                    "keywords_used": expanded_keywords,
+                }))
             except Exception as exc:
-                logger.exception("Search provider failed for keyword '%s': %s", keyword, exc)
-                continue
-
-            total_results_found += len(results)
-
-            for result in results:
-                link = result.get("link")
-                if not link:
-                    continue
-
-                try:
-                    if lead_exists(link):
-                        skipped_existing += 1
-                        continue
-
-                    content = scrape_content(link)
-                    if not content:
-                        continue
-
-                    intent = analyze_intent(content)
-                    result["intent_analysis"] = intent
-                    result["imre_score"] = calculate_imre(result)
-
-                    save_lead(result)
-                    new_leads_processed += 1
-
-                    level = intent.get("intent_level", "No Intent")
-
-                    if level == "High Intent":
-                        high_intent += 1
-                    elif level == "Medium Intent":
-                        medium_intent += 1
-                    elif level == "Low Intent":
-                        low_intent += 1
-                    else:
-                        no_intent += 1
-
-                    all_results.append(result)
-                except Exception as exc:
-                    logger.exception("Lead processing failed for link '%s': %s", link, exc)
-                    continue
-
-        all_results = deduplicate_leads(all_results)
-
-        all_results = sorted(
-            all_results,
-            key=lambda x: x.get("imre_score", 0),
-            reverse=True
-        )
-
-        if min_intent > 0:
-            all_results = [
-                lead for lead in all_results
-                if lead["intent_analysis"].get("intent_score", 0) >= min_intent
-            ]
-
-        end_time = time.time()
-        processing_time = round(end_time - start_time, 2)
-
-        logger.info(
-            f"Search completed | Results: {total_results_found} | "
-            f"New: {new_leads_processed} | Skipped: {skipped_existing} | "
-            f"High: {high_intent} | Medium: {medium_intent} | "
-            f"Low: {low_intent} | Time: {processing_time}s"
-        )
-
-        return {
-            "processing_time_seconds": processing_time,
-            "stats": {
-                "total_keywords": len(expanded_keywords),
-                "total_results_found": total_results_found,
-                "new_leads_processed": new_leads_processed,
-                "skipped_existing": skipped_existing,
-                "high_intent": high_intent,
-                "medium_intent": medium_intent,
-                "low_intent": low_intent,
-                "no_intent": no_intent
-            },
-            "keywords_used": expanded_keywords,
-            "leads": all_results
-        }
-    except HTTPException:
-        raise
-    except Exception as exc:
-        logger.exception("Unhandled /intent/search failure: %s", exc)
-        raise HTTPException(status_code=500, detail="Search failed inside AI service")
\ No newline at end of file
+                logger.exception("Unhandled /intent/search/stream failure: %s", exc)
+                await outbox.put(("error", {"detail": "Search failed inside AI service"}))
+
+        task = asyncio.create_task(run())
+
+        try:
+            while True:
+                event, data = await outbox.get()
+                yield frame(event, data)
+
+                if event != "lead":
+                    break
+        finally:
+            # Client went away early: stop fetching on its behalf
+            task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,95 @@
+"""
+Compare intent scores of an embedding backend against the PyTorch one.
+
+    python -m intent_engine.app.scripts.embedding_parity --backend onnx-int8
+
+Every fixture text is embedded by both backends and scored against the
+same intent examples. The check fails (exit code 1) if any intent_score
+differs by more than --tolerance points.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+
+from intent_engine.app.services import embedding_backend_service
+from intent_engine.app.services import intent_index_service
+from intent_engine.app.services import intent_service
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "intent_parity.json")
+
+MATCH_COUNT = 20
+
+
+def _score(embeddings):
+    matches = intent_index_service.search_many(embeddings, match_count=MATCH_COUNT)
+
+    if matches is None:
+        matches = [
+            intent_service.search_similar_intents(embedding.tolist(), match_count=MATCH_COUNT)
+            for embedding in embeddings
+        ]
+
+    return [intent_service._aggregate_matches(results) for results in matches]
+
+
+def _encode(backend, texts):
+    model = embedding_backend_service.load_model(backend=backend)
+
+    # One untimed call so lazy session/graph setup is not counted
+    model.encode(texts[:1])
+
+    started = time.perf_counter()
+    embeddings = np.asarray(model.encode(texts), dtype=np.float32)
+    return embeddings, time.perf_counter() - started
+
+
+def _cosine(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return np.sum(a * b, axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", default="onnx-int8", choices=embedding_backend_service.BACKENDS)
+    parser.add_argument("--tolerance", type=float, default=2.0, help="max intent_score difference in points")
+    parser.add_argument("--fixtures", default=FIXTURE_PATH)
+    args = parser.parse_args()
+
+    with open(args.fixtures, encoding="utf-8") as handle:
+        texts = json.load(handle)
+
+    reference, reference_seconds = _encode("torch", texts)
+    candidate, candidate_seconds = _encode(args.backend, texts)
+
+    expected = _score(reference)
+    actual = _score(candidate)
+    cosines = _cosine(reference, candidate)
+
+    failures = 0
+
+    for text, before, after, cosine in zip(texts, expected, actual, cosines):
+        diff = abs(before["intent_score"] - after["intent_score"])
+        failed = diff > args.tolerance
+        failures += failed
+
+        print(
+            f"{'FAIL' if failed else 'ok  '} "
+            f"{before['intent_score']:>3} -> {after['intent_score']:>3} "
+            f"(cos {cosine:.4f}) {text[:60]}"
+        )
+
+    print()
+    print(f"torch:      {reference_seconds * 1000:.1f} ms for {len(texts)} texts")
+    print(f"{args.backend + ':':<11} {candidate_seconds * 1000:.1f} ms for {len(texts)} texts")
+    print(f"min cosine: {cosines.min():.4f}")
+    print(f"{failures} of {len(texts)} scores outside ±{args.tolerance}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,36 @@
-from urllib.parse import urlparse
+import re
+import hashlib
+import numpy as np
+from collections import defaultdict
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+
+from intent_engine.app.config import NEAR_DUPLICATE_THRESHOLD
+
+# Query parameters that only track the click, never change the page
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "yclid", "dclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "ref", "ref_src", "spm",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+# MinHash signature: LSH_BANDS bands of LSH_ROWS rows each. Pairs that
+# share a band are compared; with 16 x 4 a pair at Jaccard 0.8 shares one
+# with ~99.9% probability, while pairs below 0.3 almost never collide.
+LSH_BANDS = 16
+LSH_ROWS = 4
+NUM_PERMUTATIONS = LSH_BANDS * LSH_ROWS
+
+# Below this many distinct tokens a signature is too coarse to call two
+# texts the same
+MIN_SHINGLES = 8
+
+# Universal hashing (a * h + b) mod p stands in for the permutations
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240601)
+_PERM_A = _rng.integers(1, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
 
 def normalize_title(title: str):
     return title.strip().lower()
@@ -7,29 +39,141 @@ def extract_domain(url: str):
     parsed = urlparse(url)
     return parsed.netloc.replace("www.", "")
 
-def deduplicate_leads(leads):
+# =========================
+# URL CANONICALIZATION
+# =========================
+
+def canonicalize_url(url: str):
+    """
+    Collapse the trivial variants of a URL onto one form: lowercase
+    scheme/host without `www.` or a default port, no fragment, no tracking
+    parameters, sorted query and no trailing slash. A URL that cannot be
+    parsed (e.g. a non-numeric port) is returned as given.
+    """
+    url = (url or "").strip()
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    if port and not (parts.scheme == "http" and port == 80) and not (parts.scheme == "https" and port == 443):
+        host = f"{host}:{port}"
+
+    query = urlencode(sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ))
+
+    path = parts.path.rstrip("/") or "/"
+
+    return urlunsplit((parts.scheme.lower(), host, path, query, ""))
+
+# =========================
+# MINHASH
+# =========================
 
-    seen_urls = set()
-    seen_titles = set()
+def _token_hash(token: str):
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "big") % _PRIME
 
-    unique_leads = []
+def minhash(text: str):
+    """
+    MinHash signature of the text's word set, or None when the text is
+    too short to fingerprint reliably.
+    """
+    tokens = set(TOKEN_PATTERN.findall((text or "").lower()))
+    if len(tokens) < MIN_SHINGLES:
+        return None
 
-    for lead in leads:
+    hashes = np.fromiter((_token_hash(token) for token in tokens), dtype=np.uint64, count=len(tokens))
 
-        url = lead.get("link", "")
-        title = lead.get("title", "")
+    # Every permutation/token pair at once; a, h < 2^31 keeps the product
+    # well inside 64 bits
+    permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _PRIME
+    return permuted.min(axis=1)
 
-        normalized_title = normalize_title(title)
+def _similarity(signature, other):
+    return float(np.mean(signature == other))
 
-        if url in seen_urls:
-            continue
+def _lead_text(lead):
+    return " ".join(
+        part for part in (lead.get("title"), lead.get("snippet"), lead.get("content"))
+        if part
+    )
 
-        if normalized_title in seen_titles:
-            continue
+# =========================
+# DUPLICATE DETECTION
+# =========================
 
-        seen_urls.add(url)
-        seen_titles.add(normalized_title)
+class DuplicateFilter:
+    """
+    Incremental duplicate check: a lead is a duplicate when it repeats one
+    checked earlier by canonical URL, normalized title, or title+snippet
+    (+content) whose estimated Jaccard similarity is at least `threshold`.
+
+    Signatures are bucketed per LSH band, so each lead is only compared
+    with the few earlier leads it collides with and a pass over n leads
+    stays roughly linear.
+    """
+
+    def __init__(self, threshold=NEAR_DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.seen_urls = set()
+        self.seen_titles = set()
+        self.buckets = defaultdict(list)
+        self.signatures = []
+
+    def is_duplicate(self, lead):
+        """True if `lead` repeats an earlier one; otherwise remember it."""
+        url = canonicalize_url(lead.get("link", ""))
+        title = normalize_title(lead.get("title") or "")
+
+        if url in self.seen_urls or title in self.seen_titles:
+            return True
+
+        signature = minhash(_lead_text(lead))
+
+        if signature is not None:
+            keys = [
+                (band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes())
+                for band in range(LSH_BANDS)
+            ]
+
+            candidates = {other for key in keys for other in self.buckets[key]}
+
+            if any(_similarity(signature, self.signatures[other]) >= self.threshold for other in candidates):
+                return True
+
+            self.signatures.append(signature)
+            for key in keys:
+                self.buckets[key].append(len(self.signatures) - 1)
+
+        self.seen_urls.add(url)
+        self.seen_titles.add(title)
+
+        return False
+
+def find_duplicates(leads, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """Positions of leads that repeat an earlier one (see DuplicateFilter)."""
+    duplicates = DuplicateFilter(threshold)
+
+    return {
+        position for position, lead in enumerate(leads)
+        if duplicates.is_duplicate(lead)
+    }
+
+def deduplicate_leads(leads):
 
-        unique_leads.append(lead)
+    duplicates = find_duplicates(leads)
 
-    return unique_leads
\ No newline at end of file
+    return [
+        lead for position, lead in enumerate(leads)
+        if position not in duplicates
+    ]
@@ -0,0 +1,79 @@
+import os
+import logging
+
+from intent_engine.app.config import (
+    INTENT_MODEL_NAME,
+    INTENT_EMBEDDING_BACKEND,
+    INTENT_ONNX_QUANTIZATION,
+    INTENT_ONNX_DIR,
+)
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# =========================
+# MODEL LOADING
+# =========================
+
+def model_key(model_name=INTENT_MODEL_NAME, backend=INTENT_EMBEDDING_BACKEND):
+    """
+    Name cached embeddings are stored under.
+
+    The PyTorch backend keeps the bare model name so existing cache
+    entries stay valid; ONNX vectors differ slightly and get their own.
+    """
+    if backend == "torch":
+        return model_name
+    if backend == "onnx-int8":
+        return f"{model_name}:{backend}:{INTENT_ONNX_QUANTIZATION}"
+    return f"{model_name}:{backend}"
+
+
+def _export_dir(model_name):
+    return os.path.join(INTENT_ONNX_DIR, model_name.replace("/", "__"))
+
+
+def _load_int8(model_name):
+    """
+    Load the dynamically quantized ONNX model, quantizing it on first use.
+
+    The export needs `optimum[onnxruntime]`; it runs once per model and
+    instruction set, later starts read the file from INTENT_ONNX_DIR.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    export_dir = _export_dir(model_name)
+    file_name = f"onnx/model_qint8_{INTENT_ONNX_QUANTIZATION}.onnx"
+
+    if not os.path.exists(os.path.join(export_dir, file_name)):
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        logger.info("Quantizing %s to int8 (%s) in %s", model_name, INTENT_ONNX_QUANTIZATION, export_dir)
+
+        fp32 = SentenceTransformer(model_name, backend="onnx", device="cpu")
+        fp32.save(export_dir)
+        export_dynamic_quantized_onnx_model(fp32, INTENT_ONNX_QUANTIZATION, export_dir)
+
+    return SentenceTransformer(
+        export_dir,
+        backend="onnx",
+        device="cpu",
+        model_kwargs={"file_name": file_name},
+    )
+
+
+def load_model(model_name=INTENT_MODEL_NAME, backend=INTENT_EMBEDDING_BACKEND):
+    """SentenceTransformer for `model_name` running on the given backend."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+
+    if backend == "onnx":
+        return SentenceTransformer(model_name, backend="onnx", device="cpu")
+
+    return _load_int8(model_name)
@@ -0,0 +1,190 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+
+from intent_engine.app.config import (
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_MEMORY_ITEMS,
+    EMBEDDING_CACHE_MAX_ROWS,
+)
+from intent_engine.app.utils.sqlite_utils import open_cache_db
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps bound parameters per statement; stay well below it
+LOOKUP_CHUNK_SIZE = 500
+
+# After an eviction pass the disk tier is brought down to this share of its
+# cap, so a full cache does not evict on every store
+EVICT_TO_RATIO = 0.9
+
+# =========================
+# STORAGE
+# =========================
+
+# Hot tier: (model, hash) -> float32 vector, least recently used first
+_memory = OrderedDict()
+
+_lock = threading.Lock()
+_conn = None
+
+_counters = {
+    "memory_hits": 0,
+    "disk_hits": 0,
+    "misses": 0,
+    "evictions": 0,
+}
+
+
+def _connect():
+    global _conn
+
+    if _conn is None:
+        # Vectors are kept as float16 bytes: half the size, and well within
+        # the precision the similarity scores are rounded to
+        conn = open_cache_db(EMBEDDING_CACHE_PATH, """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (model, hash)
+            );
+        """)
+
+        # Cache files written before eviction existed lack accessed_at
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(embeddings)")}
+        if "accessed_at" not in columns:
+            conn.execute("ALTER TABLE embeddings ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+
+        conn.execute("CREATE INDEX IF NOT EXISTS embeddings_accessed_at ON embeddings (accessed_at)")
+        conn.commit()
+
+        _conn = conn
+
+    return _conn
+
+
+def _evict(conn):
+    """Drop least recently used rows once the disk tier is over its cap."""
+    # Counted in the file, not in memory: every worker writes to it
+    rows = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    if rows <= EMBEDDING_CACHE_MAX_ROWS:
+        return
+
+    excess = rows - int(EMBEDDING_CACHE_MAX_ROWS * EVICT_TO_RATIO)
+    conn.execute(
+        "DELETE FROM embeddings WHERE rowid IN "
+        "(SELECT rowid FROM embeddings ORDER BY accessed_at LIMIT ?)",
+        (excess,)
+    )
+    _counters["evictions"] += excess
+
+    logger.info("Embedding cache evicted %d rows", excess)
+
+
+def _remember(key, vector):
+    _memory[key] = vector
+    _memory.move_to_end(key)
+
+    while len(_memory) > EMBEDDING_CACHE_MEMORY_ITEMS:
+        _memory.popitem(last=False)
+
+
+# =========================
+# LOOKUP / STORE
+# =========================
+
+def get_many(model_name, hashes):
+    """Return {hash: float32 vector} for every hash cached under `model_name`."""
+    found = {}
+    missing = []
+
+    with _lock:
+        for content_hash in hashes:
+            vector = _memory.get((model_name, content_hash))
+
+            if vector is not None:
+                _memory.move_to_end((model_name, content_hash))
+                found[content_hash] = vector
+            else:
+                missing.append(content_hash)
+
+        _counters["memory_hits"] += len(found)
+
+        if missing:
+            try:
+                conn = _connect()
+                now = time.time()
+
+                for start in range(0, len(missing), LOOKUP_CHUNK_SIZE):
+                    chunk = missing[start:start + LOOKUP_CHUNK_SIZE]
+                    rows = conn.execute(
+                        f"SELECT hash, vector FROM embeddings WHERE model = ? "
+                        f"AND hash IN ({','.join('?' * len(chunk))})",
+                        (model_name, *chunk)
+                    ).fetchall()
+
+                    for content_hash, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+                        found[content_hash] = vector
+                        _remember((model_name, content_hash), vector)
+                        _counters["disk_hits"] += 1
+
+                    conn.executemany(
+                        "UPDATE embeddings SET accessed_at = ? WHERE model = ? AND hash = ?",
+                        [(now, model_name, content_hash) for content_hash, _ in rows]
+                    )
+
+                conn.commit()
+
+            except Exception as exc:
+                logger.warning("Embedding cache lookup failed: %s", exc)
+
+        _counters["misses"] += len(set(hashes) - found.keys())
+
+    return found
+
+
+def put_many(model_name, hashes, vectors):
+    now = time.time()
+
+    with _lock:
+        for content_hash, vector in zip(hashes, vectors):
+            _remember((model_name, content_hash), np.asarray(vector, dtype=np.float32))
+
+        try:
+            conn = _connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, hash, vector, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (model_name, content_hash, np.asarray(vector, dtype=np.float16).tobytes(), now, now)
+                    for content_hash, vector in zip(hashes, vectors)
+                ]
+            )
+            _evict(conn)
+            conn.commit()
+        except Exception as exc:
+            logger.warning("Embedding cache store failed: %s", exc)
+            try:
+                _conn.rollback()
+            except Exception:
+                pass
+
+
+def stats():
+    with _lock:
+        lookups = _counters["memory_hits"] + _counters["disk_hits"] + _counters["misses"]
+
+        return {
+            **_counters,
+            "memory_items": len(_memory),
+            "memory_capacity": EMBEDDING_CACHE_MEMORY_ITEMS,
+            "disk_capacity": EMBEDDING_CACHE_MAX_ROWS,
+            "hit_ratio": round((lookups - _counters["misses"]) / lookups, 3) if lookups else 0.0,
+        }
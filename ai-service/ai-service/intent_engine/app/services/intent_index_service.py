@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import logging
+import threading
+import numpy as np
+from supabase import create_client
+
+from intent_engine.app.config import (
+    INTENT_EXAMPLES_TABLE,
+    INTENT_INDEX_REFRESH_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 1000
+
+# After a failed load, wait this long before trying again on the hot path
+RETRY_SECONDS = 60
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+supabase = None
+if SUPABASE_URL and SUPABASE_KEY:
+    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+# =========================
+# INDEX STATE
+# =========================
+
+# Swapped as a whole on refresh so readers never see a half-built index
+_index = None
+_last_attempt = 0.0
+_refresh_lock = threading.Lock()
+
+
+def _parse_embedding(value):
+    # pgvector columns come back from PostgREST as "[0.1,0.2,...]"
+    if isinstance(value, str):
+        value = json.loads(value)
+    return value
+
+
+def _load_rows():
+    rows = []
+    start = 0
+
+    while True:
+        response = (
+            supabase.table(INTENT_EXAMPLES_TABLE)
+            .select("bucket, intent_weight, embedding")
+            .range(start, start + PAGE_SIZE - 1)
+            .execute()
+        )
+
+        rows.extend(response.data)
+
+        if len(response.data) < PAGE_SIZE:
+            return rows
+
+        start += PAGE_SIZE
+
+
+def refresh():
+    """Reload every intent example into a normalized in-memory matrix."""
+    global _index, _last_attempt
+
+    if supabase is None:
+        return None
+
+    with _refresh_lock:
+        started = _last_attempt = time.time()
+        rows = [row for row in _load_rows() if row.get("embedding")]
+
+        if not rows:
+            logger.warning("Intent index: %s is empty, keeping RPC search", INTENT_EXAMPLES_TABLE)
+            return _index
+
+        matrix = np.asarray(
+            [_parse_embedding(row["embedding"]) for row in rows],
+            dtype=np.float32
+        )
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+
+        _index = {
+            "matrix": matrix,
+            "buckets": [row["bucket"] for row in rows],
+            "weights": [row["intent_weight"] for row in rows],
+            "loaded_at": time.time(),
+        }
+
+        logger.info(
+            "Intent index loaded | %d examples | %.2fs",
+            len(rows), time.time() - started
+        )
+        return _index
+
+
+def _refresh_quietly():
+    try:
+        refresh()
+    except Exception as exc:
+        logger.exception("Intent index refresh failed: %s", exc)
+
+
+def get_index():
+    """
+    Current index, or None when it could not be loaded.
+
+    A stale index keeps serving while a background thread reloads it.
+    """
+    index = _index
+
+    if index is None:
+        if time.time() - _last_attempt > RETRY_SECONDS:
+            _refresh_quietly()
+        return _index
+
+    if time.time() - index["loaded_at"] > INTENT_INDEX_REFRESH_SECONDS and not _refresh_lock.locked():
+        threading.Thread(target=_refresh_quietly, daemon=True).start()
+
+    return index
+
+
+def status():
+    index = _index
+
+    if index is None:
+        return {"loaded": False}
+
+    return {
+        "loaded": True,
+        "examples": len(index["buckets"]),
+        "dimensions": int(index["matrix"].shape[1]),
+        "age_seconds": round(time.time() - index["loaded_at"], 1),
+    }
+
+
+# =========================
+# TOP-K SEARCH
+# =========================
+
+def search_many(embeddings, match_count=10):
+    """
+    Top-k cosine matches for each row of `embeddings`.
+
+    Returns one list per query shaped like the match_intent_examples RPC
+    rows (bucket, similarity, intent_weight), or None if there is no
+    index to search.
+    """
+    index = get_index()
+    if index is None:
+        return None
+
+    queries = np.asarray(embeddings, dtype=np.float32)
+    if queries.ndim == 1:
+        queries = queries[np.newaxis, :]
+
+    norms = np.linalg.norm(queries, axis=1, keepdims=True)
+    queries = queries / np.where(norms == 0, 1, norms)
+
+    scores = queries @ index["matrix"].T
+    k = min(match_count, scores.shape[1])
+
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+    matches = []
+    for row, candidates in enumerate(top):
+        ordered = candidates[np.argsort(-scores[row, candidates])]
+        matches.append([
+            {
+                "bucket": index["buckets"][i],
+                "similarity": float(scores[row, i]),
+                "intent_weight": index["weights"][i],
+            }
+            for i in ordered
+        ])
+
+    return matches
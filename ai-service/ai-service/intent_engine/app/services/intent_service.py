@@ -2,10 +2,17 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from supabase import create_client, Client
-from sentence_transformers import SentenceTransformer
 import os
+import threading
+import numpy as np
 from collections import Counter
 
+from intent_engine.app.config import INTENT_ENCODE_BATCH_SIZE, INTENT_EMBEDDING_BACKEND
+from intent_engine.app.services import intent_index_service
+from intent_engine.app.services import embedding_backend_service
+from intent_engine.app.services import embedding_cache_service
+from intent_engine.app.utils.hash_utils import content_hash
+
 # =========================
 # CONFIG
 # =========================
@@ -13,23 +20,52 @@ from collections import Counter
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-# Create Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase: Client | None = None
+
+# Cached embeddings are only reused by the backend that produced them
+EMBEDDING_MODEL_KEY = embedding_backend_service.model_key()
 
 # =========================
-# LOAD MODEL ON STARTUP (CACHED)
+# LAZY MODEL LOADING
 # =========================
 
-print("Loading embedding model...")
-model = SentenceTransformer("all-MiniLM-L6-v2")
-print("Model loaded successfully.")
+# Loaded on first use (or by the warm-up at startup), never at import:
+# importing torch and the model weights takes several seconds.
+model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    global model
+
+    if model is None:
+        with _model_lock:
+            if model is None:
+                print(f"Loading embedding model ({INTENT_EMBEDDING_BACKEND})...")
+                model = embedding_backend_service.load_model()
+                print("Model loaded successfully.")
+
+    return model
+
+
+def is_model_loaded():
+    return model is not None
+
+
+def get_supabase():
+    global supabase
+
+    if supabase is None:
+        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+    return supabase
 
 # =========================
 # VECTOR SEARCH FUNCTION
 # =========================
 
 def search_similar_intents(embedding, match_count=10):
-    response = supabase.rpc(
+    response = get_supabase().rpc(
         "match_intent_examples",
         {
             "query_embedding": embedding,
@@ -44,17 +80,15 @@ def search_similar_intents(embedding, match_count=10):
 # MAIN INTENT ANALYSIS
 # =========================
 
-def analyze_intent(text: str):
+def _insufficient_content():
+    return {
+        "buying_intent": False,
+        "intent_score": 0,
+        "reason": "Insufficient content"
+    }
 
-    if not text or len(text.strip()) < 20:
-        return {
-            "buying_intent": False,
-            "intent_score": 0,
-            "reason": "Insufficient content"
-        }
 
-    query_embedding = model.encode(text).tolist()
-    results = search_similar_intents(query_embedding, match_count=20)
+def _aggregate_matches(results):
 
     if not results:
         return {
@@ -63,8 +97,6 @@ def analyze_intent(text: str):
             "reason": "No similarity matches found"
         }
 
-    from collections import Counter
-
     bucket_counter = Counter()
     weighted_score = 0
     total_similarity = 0
@@ -110,4 +142,68 @@ def analyze_intent(text: str):
         "bucket_distribution": dict(bucket_counter),
         "dominant_bucket": dominant_bucket,
         "max_similarity": round(max_similarity, 3)
-    }
\ No newline at end of file
+    }
+
+
+def embed_texts(texts, batch_size=INTENT_ENCODE_BATCH_SIZE):
+    """
+    Embeddings for `texts`, one row each.
+
+    Texts already embedded by this model (same content hash) come from the
+    embedding cache; only the rest are encoded, in `batch_size` chunks.
+    """
+    hashes = [content_hash(text) for text in texts]
+    cached = embedding_cache_service.get_many(EMBEDDING_MODEL_KEY, hashes)
+
+    # Identical texts within the batch are encoded once
+    to_encode = {}
+    for text, text_hash in zip(texts, hashes):
+        if text_hash not in cached and text_hash not in to_encode:
+            to_encode[text_hash] = text
+
+    if to_encode:
+        encoded = get_model().encode(list(to_encode.values()), batch_size=batch_size)
+        embedding_cache_service.put_many(EMBEDDING_MODEL_KEY, list(to_encode.keys()), encoded)
+        cached.update(zip(to_encode.keys(), encoded))
+
+    return np.asarray([cached[text_hash] for text_hash in hashes], dtype=np.float32)
+
+
+def analyze_intents(texts, batch_size=INTENT_ENCODE_BATCH_SIZE):
+    """
+    Analyze several documents at once.
+
+    All usable texts go through the model in `batch_size` chunks instead
+    of one encode call per document; results keep the order of `texts`.
+    """
+    analyses = [None] * len(texts)
+    pending = []
+
+    for position, text in enumerate(texts):
+        if not text or len(text.strip()) < 20:
+            analyses[position] = _insufficient_content()
+        else:
+            pending.append(position)
+
+    if not pending:
+        return analyses
+
+    embeddings = embed_texts([texts[position] for position in pending], batch_size)
+
+    # In-memory index first; the RPC is only used if it could not load
+    matches = intent_index_service.search_many(embeddings, match_count=20)
+
+    if matches is None:
+        matches = [
+            search_similar_intents(embedding.tolist(), match_count=20)
+            for embedding in embeddings
+        ]
+
+    for position, results in zip(pending, matches):
+        analyses[position] = _aggregate_matches(results)
+
+    return analyses
+
+
+def analyze_intent(text: str):
+    return analyze_intents([text])[0]
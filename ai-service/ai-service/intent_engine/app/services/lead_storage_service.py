@@ -1,10 +1,17 @@
 from supabase import create_client
 from urllib.parse import urlparse
+from intent_engine.app.services.dedup_service import canonicalize_url
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
+# Links per `in_` filter; keeps the PostgREST query string well under URL limits
+LOOKUP_CHUNK_SIZE = 100
+
 supabase = None
 if SUPABASE_URL and SUPABASE_KEY:
     supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
@@ -12,33 +19,82 @@ if SUPABASE_URL and SUPABASE_KEY:
 def extract_domain(url):
     return urlparse(url).netloc.replace("www.", "")
 
-def save_lead(lead):
+def _lead_row(lead):
+    return {
+        "title": lead.get("title"),
+        # Stored as found, since the dashboard shows and opens it; dedup
+        # goes through the canonical form (see existing_links)
+        "link": lead.get("link"),
+        "domain": extract_domain(lead.get("link", "")),
+        "intent_score": lead["intent_analysis"]["intent_score"],
+        # Analyses of thin or unmatched pages carry no level
+        "intent_level": lead["intent_analysis"].get("intent_level", "No Intent"),
+        "imre_score": lead.get("imre_score")
+    }
+
+def existing_links(links):
+    """
+    Return the subset of `links` already stored in the leads table, as
+    given or in canonical form.
+    """
+    if supabase is None:
+        return set()
+
+    # Every form to look up -> the given links it stands for
+    forms = {}
+    for link in links:
+        if link:
+            forms.setdefault(link, set()).add(link)
+            forms.setdefault(canonicalize_url(link), set()).add(link)
+
+    lookups = list(forms)
+    found = set()
 
     try:
-        if supabase is None:
-            return
+        for start in range(0, len(lookups), LOOKUP_CHUNK_SIZE):
+            chunk = lookups[start:start + LOOKUP_CHUNK_SIZE]
+            response = supabase.table("leads").select("link").in_("link", chunk).execute()
 
-        data = {
-            "title": lead.get("title"),
-            "link": lead.get("link"),
-            "domain": extract_domain(lead.get("link", "")),
-            "intent_score": lead["intent_analysis"]["intent_score"],
-            "intent_level": lead["intent_analysis"]["intent_level"],
-            "imre_score": lead.get("imre_score")
-        }
+            for row in response.data:
+                found.update(forms.get(row["link"], ()))
+    except Exception as exc:
+        logger.exception("Lead lookup failed for %d links: %s", len(links), exc)
 
-        supabase.table("leads").insert(data).execute()
+    return found
 
-    except Exception:
-        # Ignore duplicates (because link is unique)
-        pass
+def save_leads(leads):
+    """
+    Insert `leads` in one upsert and return the links that were really
+    new, in canonical form.
+
+    Rows whose link is already stored are left untouched and not returned.
+    Raises if the insert itself fails.
+    """
+    if not leads:
+        return set()
 
-def lead_exists(link):
     if supabase is None:
-        return False
+        return {canonicalize_url(lead.get("link")) for lead in leads}
+
+    response = (
+        supabase.table("leads")
+        .upsert(
+            [_lead_row(lead) for lead in leads],
+            on_conflict="link",
+            ignore_duplicates=True
+        )
+        .execute()
+    )
+
+    return {canonicalize_url(row["link"]) for row in response.data}
+
+def save_lead(lead):
 
     try:
-        response = supabase.table("leads").select("id").eq("link", link).execute()
-        return len(response.data) > 0
+        save_leads([lead])
     except Exception:
-        return False
\ No newline at end of file
+        # Ignore duplicates (because link is unique)
+        pass
+
+def lead_exists(link):
+    return link in existing_links([link])
@@ -0,0 +1,204 @@
+import time
+import logging
+import threading
+
+from intent_engine.app.config import (
+    PAGE_CACHE_PATH,
+    PAGE_CACHE_TTL_SECONDS,
+    PAGE_CACHE_MAX_BYTES,
+    PAGE_CACHE_TOUCH_SECONDS,
+)
+from intent_engine.app.utils.sqlite_utils import open_cache_db
+from intent_engine.app.services.dedup_service import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# After an eviction pass the cache is brought down to this share of its cap,
+# so a full cache does not evict on every single insert
+EVICT_TO_RATIO = 0.9
+
+# =========================
+# STORAGE
+# =========================
+
+_lock = threading.Lock()
+_conn = None
+
+_counters = {
+    "hits": 0,
+    "misses": 0,
+    "revalidated": 0,
+    "stale_served": 0,
+    "stores": 0,
+    "evictions": 0,
+    "bytes_saved": 0,
+}
+
+
+def _connect():
+    global _conn
+
+    if _conn is not None:
+        return _conn
+
+    _conn = open_cache_db(PAGE_CACHE_PATH, """
+        CREATE TABLE IF NOT EXISTS pages (
+            key TEXT PRIMARY KEY,
+            text TEXT NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            origin_bytes INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            fetched_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);
+    """)
+
+    return _conn
+
+
+def _size_bytes(conn):
+    # Read from the file, not tracked in memory: every worker process
+    # writes to the same cache
+    return conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+
+def cache_key(url):
+    # Tracking-parameter and www. variants of a page share one entry
+    return canonicalize_url(url)
+
+
+# =========================
+# LOOKUP / STORE
+# =========================
+
+def lookup(url):
+    """
+    Cached entry for `url` or None.
+
+    The entry carries `fresh` (younger than PAGE_CACHE_TTL_SECONDS) plus the
+    validators needed to revalidate it when it is not.
+    """
+    key = cache_key(url)
+    now = time.time()
+
+    with _lock:
+        conn = _connect()
+        row = conn.execute(
+            "SELECT text, etag, last_modified, origin_bytes, fetched_at, accessed_at FROM pages WHERE key = ?",
+            (key,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        # LRU order only needs minute precision; skipping the write keeps
+        # hits read-only
+        if now - row[5] > PAGE_CACHE_TOUCH_SECONDS:
+            conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+
+    text, etag, last_modified, origin_bytes, fetched_at, _ = row
+
+    return {
+        "text": text,
+        "etag": etag,
+        "last_modified": last_modified,
+        "origin_bytes": origin_bytes,
+        "fresh": now - fetched_at < PAGE_CACHE_TTL_SECONDS,
+    }
+
+
+def record_hit(entry, revalidated=False):
+    with _lock:
+        _counters["revalidated" if revalidated else "hits"] += 1
+        _counters["bytes_saved"] += entry["origin_bytes"]
+
+
+def record_miss():
+    with _lock:
+        _counters["misses"] += 1
+
+
+def record_stale_served():
+    with _lock:
+        _counters["stale_served"] += 1
+
+
+def mark_revalidated(url):
+    """The origin answered 304: the entry is good for another TTL."""
+    with _lock:
+        conn = _connect()
+        conn.execute(
+            "UPDATE pages SET fetched_at = ? WHERE key = ?",
+            (time.time(), cache_key(url))
+        )
+        conn.commit()
+
+
+def store(url, text, etag=None, last_modified=None, origin_bytes=0):
+    key = cache_key(url)
+    size = len(text.encode("utf-8"))
+    now = time.time()
+
+    with _lock:
+        conn = _connect()
+
+        # The insert opens the write transaction, so the size checked below
+        # includes every other process's committed writes and no other
+        # writer can change it before this one commits
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO pages
+            (key, text, etag, last_modified, origin_bytes, size, fetched_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (key, text, etag, last_modified, origin_bytes, size, now, now)
+        )
+
+        _counters["stores"] += 1
+
+        try:
+            total_bytes = _size_bytes(conn)
+
+            if total_bytes > PAGE_CACHE_MAX_BYTES:
+                _evict(conn, total_bytes)
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def _evict(conn, total_bytes):
+    """Drop least recently used pages until the cache is under its target size."""
+    target = PAGE_CACHE_MAX_BYTES * EVICT_TO_RATIO
+    victims = []
+
+    for key, size in conn.execute("SELECT key, size FROM pages ORDER BY accessed_at"):
+        if total_bytes <= target:
+            break
+        victims.append((key,))
+        total_bytes -= size
+
+    conn.executemany("DELETE FROM pages WHERE key = ?", victims)
+    _counters["evictions"] += len(victims)
+
+    logger.info("Page cache evicted %d entries", len(victims))
+
+
+def stats():
+    with _lock:
+        conn = _connect()
+        entries = conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+        lookups = _counters["hits"] + _counters["revalidated"] + _counters["misses"]
+
+        return {
+            **_counters,
+            "entries": entries,
+            "size_bytes": _size_bytes(conn),
+            "max_bytes": PAGE_CACHE_MAX_BYTES,
+            "hit_ratio": round((_counters["hits"] + _counters["revalidated"]) / lookups, 3) if lookups else 0.0,
+        }
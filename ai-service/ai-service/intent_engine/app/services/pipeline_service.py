@@ -0,0 +1,279 @@
+import asyncio
+import logging
+
+from intent_engine.app.config import (
+    PIPELINE_SEARCH_CONCURRENCY,
+    PIPELINE_FETCH_CONCURRENCY,
+    PIPELINE_SCORE_CONCURRENCY,
+    PIPELINE_QUEUE_SIZE,
+    PIPELINE_SCORE_BATCH_SIZE,
+    PIPELINE_SCORE_LINGER_MS,
+    PIPELINE_STORE_BATCH_SIZE,
+)
+from intent_engine.app.services.intent_service import analyze_intents
+from intent_engine.app.services.search_service import search_web
+from intent_engine.app.services.scraper_service import scrape_content
+from intent_engine.app.services.scoring_service import score_leads
+from intent_engine.app.services.dedup_service import canonicalize_url, find_duplicates
+from intent_engine.app.services.lead_storage_service import save_leads
+from intent_engine.app.services.lead_storage_service import existing_links
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a queue for the workers reading it
+_DONE = object()
+
+
+def _new_stats():
+    return {
+        "total_results_found": 0,
+        "new_leads_processed": 0,
+        "skipped_existing": 0,
+        "skipped_duplicates": 0,
+        "failed_inserts": 0,
+        "high_intent": 0,
+        "medium_intent": 0,
+        "low_intent": 0,
+        "no_intent": 0,
+    }
+
+
+def _count_level(stats, intent):
+    level = intent.get("intent_level", "No Intent")
+
+    if level == "High Intent":
+        stats["high_intent"] += 1
+    elif level == "Medium Intent":
+        stats["medium_intent"] += 1
+    elif level == "Low Intent":
+        stats["low_intent"] += 1
+    else:
+        stats["no_intent"] += 1
+
+
+async def _run_stage(worker, concurrency, outbox=None, outbox_workers=0):
+    """
+    Run `concurrency` copies of `worker` until each has finished, then
+    hand one _DONE per downstream worker to `outbox`. The _DONEs are sent
+    even if a worker raised, so downstream workers never wait forever.
+    """
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        for _ in range(outbox_workers):
+            await outbox.put(_DONE)
+
+
+async def _collect_batch(queue, first):
+    """
+    Gather up to PIPELINE_SCORE_BATCH_SIZE items starting with `first`,
+    waiting at most PIPELINE_SCORE_LINGER_MS for more to arrive.
+    Returns the batch and whether the queue's _DONE was consumed.
+    """
+    batch = [first]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + PIPELINE_SCORE_LINGER_MS / 1000
+
+    while len(batch) < PIPELINE_SCORE_BATCH_SIZE:
+        remaining = deadline - loop.time()
+
+        try:
+            if remaining > 0:
+                item = await asyncio.wait_for(queue.get(), remaining)
+            else:
+                item = queue.get_nowait()
+        except (asyncio.TimeoutError, asyncio.QueueEmpty):
+            break
+
+        if item is _DONE:
+            return batch, True
+
+        batch.append(item)
+
+    return batch, False
+
+
+async def run_search_pipeline(keywords, on_lead=None):
+    """
+    Search -> fetch -> score -> store, with bounded queues between stages.
+
+    All keywords are searched concurrently and checked against the leads
+    table in one query; fetching and scoring then overlap, and new leads
+    are written back in PIPELINE_STORE_BATCH_SIZE upserts. Returns the
+    stored leads (in keyword/result order) and the search stats.
+
+    `on_lead`, if given, is awaited with each lead as soon as it has its
+    IMRE score, before it is stored.
+    """
+    stats = _new_stats()
+    processed = []
+
+    fetch_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    score_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    store_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+
+    search_limit = asyncio.Semaphore(PIPELINE_SEARCH_CONCURRENCY)
+
+    async def search_keyword(keyword):
+        async with search_limit:
+            try:
+                return await asyncio.to_thread(search_web, keyword)
+            except Exception as exc:
+                logger.exception("Search provider failed for keyword '%s': %s", keyword, exc)
+                return []
+
+    async def search_stage():
+        pages = await asyncio.gather(*(search_keyword(keyword) for keyword in keywords))
+
+        candidates = []
+
+        for position, results in enumerate(pages):
+            stats["total_results_found"] += len(results)
+
+            for index, result in enumerate(results):
+                if result.get("link"):
+                    candidates.append({"order": (position, index), "result": result})
+
+        known = await asyncio.to_thread(
+            existing_links,
+            [item["result"]["link"] for item in candidates]
+        )
+
+        # A link found under two keywords is fetched once; the later copy
+        # counts as existing, just as it did when the first was stored
+        # before the second was looked up. Other variants of a queued URL
+        # (tracking parameters, `www.`, trailing slash) are duplicates.
+        queued_links = set()
+        queued = set()
+        fresh = []
+
+        for item in candidates:
+            link = item["result"]["link"]
+            canonical = canonicalize_url(link)
+
+            if link in known or link in queued_links:
+                stats["skipped_existing"] += 1
+                continue
+
+            if canonical in queued:
+                stats["skipped_duplicates"] += 1
+                continue
+
+            item["canonical"] = canonical
+            queued_links.add(link)
+            queued.add(canonical)
+            fresh.append(item)
+
+        # Syndicated copies and same-title pages never reach the fetcher
+        duplicates = find_duplicates([item["result"] for item in fresh])
+        stats["skipped_duplicates"] += len(duplicates)
+
+        for position, item in enumerate(fresh):
+            if position not in duplicates:
+                await fetch_queue.put(item)
+
+    async def fetch_worker():
+        while True:
+            item = await fetch_queue.get()
+            if item is _DONE:
+                return
+
+            link = item["result"]["link"]
+
+            try:
+                content = await asyncio.to_thread(scrape_content, link)
+                if not content:
+                    continue
+
+                item["content"] = content
+                await score_queue.put(item)
+            except Exception as exc:
+                logger.exception("Lead processing failed for link '%s': %s", link, exc)
+
+    async def score_worker():
+        finished = False
+
+        while not finished:
+            item = await score_queue.get()
+            if item is _DONE:
+                return
+
+            batch, finished = await _collect_batch(score_queue, item)
+
+            results = [item["result"] for item in batch]
+
+            try:
+                intents = await asyncio.to_thread(
+                    analyze_intents,
+                    [item.pop("content") for item in batch]
+                )
+
+                for result, intent in zip(results, intents):
+                    result["intent_analysis"] = intent
+
+                for result, imre_score in zip(results, score_leads(results)):
+                    result["imre_score"] = imre_score
+            except Exception as exc:
+                logger.exception("Intent scoring failed for %d leads: %s", len(batch), exc)
+                continue
+
+            for item in batch:
+                result = item["result"]
+
+                try:
+                    if on_lead is not None:
+                        await on_lead(result)
+
+                    await store_queue.put(item)
+                except Exception as exc:
+                    logger.exception("Lead processing failed for link '%s': %s", result["link"], exc)
+
+    async def store_batch(batch):
+        try:
+            inserted = await asyncio.to_thread(save_leads, [item["result"] for item in batch])
+        except Exception as exc:
+            # Storage trouble should not hide leads we already scored, but
+            # they were not stored, so they don't count as new
+            logger.exception("Lead insert failed for %d leads: %s", len(batch), exc)
+            stats["failed_inserts"] += len(batch)
+            processed.extend(batch)
+            return
+
+        for item in batch:
+            result = item["result"]
+
+            # Lost the race to another search that stored the same link
+            if item["canonical"] not in inserted:
+                stats["skipped_existing"] += 1
+                continue
+
+            stats["new_leads_processed"] += 1
+            _count_level(stats, result["intent_analysis"])
+            processed.append(item)
+
+    async def store_stage():
+        pending = []
+        finished = False
+
+        while not finished:
+            item = await store_queue.get()
+
+            if item is _DONE:
+                finished = True
+            else:
+                pending.append(item)
+
+            if pending and (finished or len(pending) >= PIPELINE_STORE_BATCH_SIZE):
+                await store_batch(pending)
+                pending = []
+
+    await asyncio.gather(
+        _run_stage(search_stage, 1, fetch_queue, PIPELINE_FETCH_CONCURRENCY),
+        _run_stage(fetch_worker, PIPELINE_FETCH_CONCURRENCY, score_queue, PIPELINE_SCORE_CONCURRENCY),
+        _run_stage(score_worker, PIPELINE_SCORE_CONCURRENCY, store_queue, 1),
+        store_stage(),
+    )
+
+    processed.sort(key=lambda item: item["order"])
+
+    return [item["result"] for item in processed], stats
@@ -0,0 +1,82 @@
+import re
+from functools import lru_cache
+import numpy as np
+
+from intent_engine.app.config import (
+    IMRE_EXPANSION_KEYWORDS,
+    IMRE_WEIGHTS,
+    IMRE_RECENCY_SCORE,
+)
+
+# =========================
+# BUYING-SIGNAL LEXICON
+# =========================
+
+@lru_cache(maxsize=32)
+def compile_lexicon(keywords):
+    """
+    One regex matching any keyword as a substring, like the old `in` loop.
+
+    Longest keywords go first so overlapping phrases report the more
+    specific match. Cached per keyword tuple, so the hot path never
+    recompiles.
+    """
+    ordered = sorted({k.lower() for k in keywords if k}, key=len, reverse=True)
+
+    if not ordered:
+        return None
+
+    return re.compile("|".join(re.escape(keyword) for keyword in ordered))
+
+
+def _lead_text(lead):
+    return ((lead.get("title") or "") + " " + (lead.get("snippet") or "")).lower()
+
+
+# =========================
+# BATCH IMRE
+# =========================
+
+def score_leads(leads, keywords=None, weights=None, recency_score=None):
+    """
+    IMRE score for every lead in one pass.
+
+    IMRE = intent * w_intent + match * w_match + recency * w_recency
+    + expansion * w_expansion, where match is max_similarity on a 0-100
+    scale and expansion is 100 if title+snippet mention any lexicon
+    keyword, rounded to 2 places. Keywords and weights default to the
+    configured values.
+    """
+    if not leads:
+        return []
+
+    keywords = tuple(IMRE_EXPANSION_KEYWORDS if keywords is None else keywords)
+    weights = {**IMRE_WEIGHTS, **(weights or {})}
+    recency_score = IMRE_RECENCY_SCORE if recency_score is None else recency_score
+
+    lexicon = compile_lexicon(keywords)
+
+    intent = np.array(
+        [lead["intent_analysis"]["intent_score"] for lead in leads],
+        dtype=np.float64
+    )
+    match_strength = np.array(
+        [lead["intent_analysis"].get("max_similarity", 0) for lead in leads],
+        dtype=np.float64
+    ) * 100
+    recency = np.full(len(leads), recency_score, dtype=np.float64)
+    expansion = np.array(
+        [100 if lexicon is not None and lexicon.search(_lead_text(lead)) else 0 for lead in leads],
+        dtype=np.float64
+    )
+
+    # Same term order as the scalar formula, so the floats come out identical
+    imre = (
+        (intent * weights["intent"]) +
+        (match_strength * weights["match"]) +
+        (recency * weights["recency"]) +
+        (expansion * weights["expansion"])
+    )
+
+    # Python's round, not np.round: it rounds the decimal value exactly
+    return [round(float(score), 2) for score in imre]
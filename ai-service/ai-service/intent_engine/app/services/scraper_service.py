@@ -1,23 +1,279 @@
+import time
+import logging
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
-def scrape_content(url):
+from intent_engine.app.config import (
+    FETCH_TIMEOUT_SECONDS,
+    FETCH_MAX_BYTES,
+    FETCH_MAX_TEXT_CHARS,
+    FETCH_PER_HOST_CONNECTIONS,
+    FETCH_POOL_HOSTS,
+)
+from intent_engine.app.services import page_cache_service
+
+try:
+    from lxml import etree
+except ImportError:  # fall back to BeautifulSoup below
+    etree = None
+
+logger = logging.getLogger(__name__)
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0"
+}
+
+CHUNK_SIZE = 16 * 1024
+
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+# Tags whose text never ends up in the extracted content
+SKIP_TAGS = {"script", "style", "noscript", "template"}
+
+# =========================
+# POOLED CLIENT
+# =========================
+
+# One urllib3 pool per host; pool_block makes FETCH_PER_HOST_CONNECTIONS a
+# hard cap, so a single slow site cannot soak up every socket.
+session = requests.Session()
+session.headers.update(HEADERS)
+
+_adapter = HTTPAdapter(
+    pool_connections=FETCH_POOL_HOSTS,
+    pool_maxsize=FETCH_PER_HOST_CONNECTIONS,
+    pool_block=True,
+)
+session.mount("http://", _adapter)
+session.mount("https://", _adapter)
+
+
+# =========================
+# TEXT EXTRACTION
+# =========================
+
+class _TextCollector:
+    """lxml parser target that keeps visible text and stops caring once full."""
+
+    def __init__(self, max_chars):
+        self.max_chars = max_chars
+        self.parts = []
+        self.chars = 0
+        self.skip_depth = 0
+
+    def start(self, tag, attrib):
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+
+    def end(self, tag):
+        if tag in SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def data(self, data):
+        if self.skip_depth or self.full:
+            return
+
+        words = data.split()
+        if words:
+            chunk = " ".join(words)
+            self.parts.append(chunk)
+            self.chars += len(chunk) + 1
+
+    def close(self):
+        return " ".join(self.parts)
+
+    @property
+    def full(self):
+        return self.chars >= self.max_chars
+
+
+def _is_binary(head: bytes):
+    if head.startswith(b"%PDF"):
+        return True
+    return b"\x00" in head[:1024]
+
+
+def _new_extractor(encoding):
+    if etree is None:
+        return None, None
+
+    collector = _TextCollector(FETCH_MAX_TEXT_CHARS)
+    parser = etree.HTMLParser(target=collector, encoding=encoding)
+    return parser, collector
+
+
+def _soup_text(raw: bytes, encoding):
+    soup = BeautifulSoup(raw, "html.parser", from_encoding=encoding)
+
+    for tag in soup(list(SKIP_TAGS)):
+        tag.decompose()
+
+    return soup.get_text(separator=" ")
+
+
+# =========================
+# FETCHER
+# =========================
+
+def _download(url, cached=None):
+    """
+    Stream `url` and return its visible text plus fetch metrics.
+
+    Reading stops at FETCH_MAX_BYTES or as soon as FETCH_MAX_TEXT_CHARS of
+    text have been extracted, whichever comes first. PDFs and other binary
+    bodies are skipped after the first chunk. With a `cached` entry the
+    request is conditional and a 304 comes back with no body read.
+    """
+    page = {
+        "url": url,
+        "text": "",
+        "status_code": None,
+        "content_type": None,
+        "etag": None,
+        "last_modified": None,
+        "bytes_fetched": 0,
+        "parse_time_ms": 0.0,
+        "skipped": None,
+        "cache": None,
+    }
+
+    headers = {}
+    if cached is not None:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    parse_time = 0.0
+
+    try:
+        with session.get(url, headers=headers, timeout=FETCH_TIMEOUT_SECONDS, stream=True) as response:
+            page["status_code"] = response.status_code
+            page["etag"] = response.headers.get("ETag")
+            page["last_modified"] = response.headers.get("Last-Modified")
+
+            if response.status_code == 304:
+                return page
+
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            page["content_type"] = content_type
+
+            if content_type and not content_type.startswith(TEXT_CONTENT_TYPES):
+                page["skipped"] = "content_type"
+                return page
+
+            parser, collector = _new_extractor(response.encoding)
+            buffered = []
+
+            for chunk in response.iter_content(CHUNK_SIZE):
+                if not chunk:
+                    continue
+
+                if page["bytes_fetched"] == 0 and _is_binary(chunk):
+                    page["skipped"] = "binary"
+                    return page
+
+                page["bytes_fetched"] += len(chunk)
+
+                started = time.perf_counter()
+                if parser is not None:
+                    parser.feed(chunk)
+                else:
+                    buffered.append(chunk)
+                parse_time += time.perf_counter() - started
+
+                if collector is not None and collector.full:
+                    break
+
+                if page["bytes_fetched"] >= FETCH_MAX_BYTES:
+                    break
+
+            started = time.perf_counter()
+            if parser is not None:
+                text = parser.close()
+            else:
+                text = _soup_text(b"".join(buffered), response.encoding)
+            parse_time += time.perf_counter() - started
+
+        page["text"] = " ".join(text.split())[:FETCH_MAX_TEXT_CHARS]
+
+    except Exception as exc:
+        page["skipped"] = "error"
+        logger.debug("Fetch failed for %s: %s", url, exc)
+
+    finally:
+        page["parse_time_ms"] = round(parse_time * 1000, 2)
+
+    return page
+
+
+def _cache_call(fn, *args, **kwargs):
+    # A locked or broken cache file must never fail a fetch that worked
+    try:
+        fn(*args, **kwargs)
+    except Exception as exc:
+        logger.warning("Page cache %s failed: %s", fn.__name__, exc)
+
+
+def fetch_page(url):
+    """
+    Visible text of `url`, served from the page cache when possible.
+
+    Fresh cache entries cost no network call; stale ones are revalidated
+    with a conditional GET, and still served if the origin is unreachable.
+    """
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0"
+        cached = page_cache_service.lookup(url)
+    except Exception as exc:
+        logger.warning("Page cache lookup failed for %s: %s", url, exc)
+        cached = None
+
+    if cached is not None and cached["fresh"]:
+        _cache_call(page_cache_service.record_hit, cached)
+        return {
+            "url": url,
+            "text": cached["text"],
+            "bytes_fetched": 0,
+            "parse_time_ms": 0.0,
+            "skipped": None,
+            "cache": "hit",
         }
 
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, "html.parser")
+    page = _download(url, cached)
+
+    if cached is not None and page["status_code"] == 304:
+        _cache_call(page_cache_service.mark_revalidated, url)
+        _cache_call(page_cache_service.record_hit, cached, revalidated=True)
+        page["text"] = cached["text"]
+        page["cache"] = "revalidated"
 
-        # Remove scripts and styles
-        for script in soup(["script", "style"]):
-            script.decompose()
+    elif cached is not None and page["skipped"] == "error":
+        _cache_call(page_cache_service.record_stale_served)
+        page["text"] = cached["text"]
+        page["cache"] = "stale"
 
-        text = soup.get_text(separator=" ")
-        clean_text = " ".join(text.split())
+    else:
+        _cache_call(page_cache_service.record_miss)
+        page["cache"] = "miss"
 
-        return clean_text[:5000]  # limit size for Gemini
+        if page["status_code"] == 200 and page["text"]:
+            _cache_call(
+                page_cache_service.store,
+                url,
+                page["text"],
+                etag=page["etag"],
+                last_modified=page["last_modified"],
+                origin_bytes=page["bytes_fetched"]
+            )
 
-    except Exception as e:
-        return ""
\ No newline at end of file
+    logger.info(
+        "Fetched %s | %s bytes | parse %sms | cache %s | %s",
+        url, page["bytes_fetched"], page["parse_time_ms"], page["cache"], page["skipped"] or "ok"
+    )
+
+    return page
+
+
+def scrape_content(url):
+    return fetch_page(url)["text"]
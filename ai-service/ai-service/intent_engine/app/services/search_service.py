@@ -1,10 +1,20 @@
 import requests
 from intent_engine.app.config import SERPER_API_KEY
+from intent_engine.app.services import serp_cache_service
 
-def search_web(query):
+RESULTS_PER_QUERY = 5
+
+def search_web(query, num=RESULTS_PER_QUERY):
     if not SERPER_API_KEY:
         return []
 
+    return serp_cache_service.get_or_fetch(
+        query,
+        num,
+        lambda: _search_serper(query, num)
+    )
+
+def _search_serper(query, num):
     url = "https://google.serper.dev/search"
 
     headers = {
@@ -14,7 +24,7 @@ def search_web(query):
 
     payload = {
         "q": query,
-        "num": 5
+        "num": num
     }
 
     response = requests.post(url, headers=headers, json=payload, timeout=15)
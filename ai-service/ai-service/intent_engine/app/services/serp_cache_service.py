@@ -0,0 +1,172 @@
+import copy
+import json
+import time
+import logging
+import threading
+from concurrent.futures import Future
+
+from intent_engine.app.config import (
+    SERP_CACHE_PATH,
+    SERP_CACHE_TTL_SECONDS,
+)
+from intent_engine.app.utils.sqlite_utils import open_cache_db
+
+logger = logging.getLogger(__name__)
+
+# Expired rows are purged once every this many writes
+PURGE_EVERY = 200
+
+# A follower never waits longer than this on someone else's upstream call
+FOLLOWER_TIMEOUT_SECONDS = 30
+
+# =========================
+# STORAGE
+# =========================
+
+_lock = threading.Lock()
+_conn = None
+_writes = 0
+
+# key -> Future of the upstream call currently running for it
+_inflight = {}
+
+_counters = {
+    "hits": 0,
+    "misses": 0,
+    "coalesced": 0,
+    "upstream_calls": 0,
+    "upstream_errors": 0,
+}
+
+
+def _connect():
+    global _conn
+
+    if _conn is None:
+        _conn = open_cache_db(SERP_CACHE_PATH, """
+            CREATE TABLE IF NOT EXISTS serp (
+                key TEXT PRIMARY KEY,
+                results TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+        """)
+
+    return _conn
+
+
+def cache_key(query, num):
+    return f"{num}:{' '.join(query.lower().split())}"
+
+
+def _lookup(key):
+    try:
+        with _lock:
+            row = _connect().execute(
+                "SELECT results, fetched_at FROM serp WHERE key = ?",
+                (key,)
+            ).fetchone()
+    except Exception as exc:
+        logger.warning("SERP cache lookup failed: %s", exc)
+        return None
+
+    if row is None or time.time() - row[1] >= SERP_CACHE_TTL_SECONDS:
+        return None
+
+    return json.loads(row[0])
+
+
+def _store(key, results):
+    global _writes
+
+    now = time.time()
+
+    with _lock:
+        conn = _connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO serp (key, results, fetched_at) VALUES (?, ?, ?)",
+            (key, json.dumps(results), now)
+        )
+
+        _writes += 1
+        if _writes % PURGE_EVERY == 0:
+            conn.execute("DELETE FROM serp WHERE fetched_at < ?", (now - SERP_CACHE_TTL_SECONDS,))
+
+        conn.commit()
+
+
+def _count(name):
+    with _lock:
+        _counters[name] += 1
+
+
+# =========================
+# SINGLE-FLIGHT READ-THROUGH
+# =========================
+
+def get_or_fetch(query, num, fetch):
+    """
+    Cached SERP results for (query, num), calling `fetch()` on a miss.
+
+    Concurrent misses for the same key share one upstream call: the first
+    caller runs `fetch`, the rest wait for its result. Errors are passed
+    to every waiter and never cached.
+    """
+    key = cache_key(query, num)
+
+    results = _lookup(key)
+    if results is not None:
+        _count("hits")
+        return results
+
+    with _lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+
+        if leader:
+            flight = Future()
+            _inflight[key] = flight
+
+    if not leader:
+        _count("coalesced")
+        return copy.deepcopy(flight.result(timeout=FOLLOWER_TIMEOUT_SECONDS))
+
+    try:
+        # Another leader may have stored it between our lookup and now
+        results = _lookup(key)
+
+        if results is not None:
+            _count("hits")
+        else:
+            _count("misses")
+            _count("upstream_calls")
+            results = fetch()
+
+            try:
+                _store(key, results)
+            except Exception as exc:
+                logger.warning("SERP cache store failed: %s", exc)
+
+        flight.set_result(results)
+        return copy.deepcopy(results)
+
+    except Exception as exc:
+        _count("upstream_errors")
+        flight.set_exception(exc)
+        raise
+
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+
+
+def stats():
+    with _lock:
+        entries = _connect().execute("SELECT COUNT(*) FROM serp").fetchone()[0]
+        lookups = _counters["hits"] + _counters["misses"] + _counters["coalesced"]
+
+        return {
+            **_counters,
+            "entries": entries,
+            "ttl_seconds": SERP_CACHE_TTL_SECONDS,
+            "hit_ratio": round((_counters["hits"] + _counters["coalesced"]) / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,11 @@
+import hashlib
+
+
+def content_hash(text: str) -> str:
+    """
+    Stable SHA-256 of `text` with whitespace runs collapsed.
+
+    Pages that differ only in spacing or line breaks hash the same.
+    """
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
@@ -0,0 +1,18 @@
+import os
+import sqlite3
+
+
+def open_cache_db(path, schema):
+    """
+    Open (creating if needed) a local SQLite cache file shared by threads.
+
+    Callers serialize access with their own lock; WAL keeps readers in
+    other processes from blocking on writes.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(schema)
+    return conn
@@ -0,0 +1,215 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from jobs import store
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+
+# Lead-by-lead progress is written at most this often
+PROGRESS_INTERVAL_SECONDS = 2
+
+# Queued/running jobs of this process get updated_at refreshed this often;
+# one whose heartbeat is older than JOB_STALE_SECONDS was lost (restart,
+# crash, redeploy) and is picked up again at the next startup
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "15"))
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "120"))
+
+# Runs a job gets in total before a lost one is marked failed instead
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "2"))
+
+_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+
+# Jobs handed to this process's pool and not finished yet
+_active = set()
+_active_lock = threading.Lock()
+_heartbeat_thread = None
+_recovery_thread = None
+
+
+# ==============================
+# JOB HANDLERS
+# ==============================
+
+def run_intent_search(job_id: str, payload: dict):
+    from intent_engine.app.routes.search_routes import SearchRequest, run_search
+
+    request = SearchRequest(**payload["request"])
+    scored = 0
+    last_report = 0.0
+
+    async def on_lead(lead):
+        nonlocal scored, last_report
+        scored += 1
+
+        now = time.time()
+        if now - last_report >= PROGRESS_INTERVAL_SECONDS:
+            last_report = now
+            await asyncio.to_thread(
+                store.set_progress, job_id, {"stage": "scoring", "leadsScored": scored}
+            )
+
+    store.set_progress(job_id, {"stage": "searching", "leadsScored": 0})
+
+    result = asyncio.run(
+        run_search(request, payload.get("min_intent", 0), on_lead=on_lead)
+    )
+
+    store.set_progress(job_id, {"stage": "done", "leadsScored": scored})
+    return result
+
+
+def run_reddit(job_id: str, payload: dict):
+    from reddit_test.reddit_scrape_test import scrape_reddit
+    from reddit_test.reddit_generate_replies import generate_reddit_replies
+
+    store.set_progress(job_id, {"stage": "scraping"})
+    inserted = scrape_reddit(user_id=payload["userId"], keywords=payload["keywords"])
+
+    store.set_progress(job_id, {"stage": "generating", "insertedPosts": inserted})
+    generate_reddit_replies(user_id=payload["userId"])
+
+    store.set_progress(job_id, {"stage": "done", "insertedPosts": inserted})
+    return {"insertedPosts": int(inserted or 0)}
+
+
+def run_quora(job_id: str, payload: dict):
+    from quora_test.quora_scrapper import scrape_quora
+    from quora_test.quora_generate_replies import generate_quora_replies
+
+    store.set_progress(job_id, {"stage": "scraping"})
+    inserted = scrape_quora(payload["userId"], payload["keywords"])
+
+    store.set_progress(job_id, {"stage": "generating", "insertedPosts": inserted})
+    replies = generate_quora_replies(payload["userId"])
+
+    store.set_progress(job_id, {"stage": "done", "insertedPosts": inserted})
+    return {
+        "insertedPosts": int(inserted or 0),
+        "generatedReplies": int(replies or 0),
+    }
+
+
+HANDLERS = {
+    "intent_search": run_intent_search,
+    "reddit_run": run_reddit,
+    "quora_run": run_quora,
+}
+
+
+# ==============================
+# EXECUTION
+# ==============================
+
+def _heartbeat_loop():
+    while True:
+        time.sleep(JOB_HEARTBEAT_SECONDS)
+
+        with _active_lock:
+            job_ids = list(_active)
+
+        try:
+            store.heartbeat(job_ids)
+        except Exception:
+            logger.exception("Job heartbeat failed for %d jobs", len(job_ids))
+
+
+def _ensure_heartbeat():
+    global _heartbeat_thread
+
+    with _active_lock:
+        if _heartbeat_thread is None:
+            _heartbeat_thread = threading.Thread(target=_heartbeat_loop, name="job-heartbeat", daemon=True)
+            _heartbeat_thread.start()
+
+
+def _enqueue(job_id: str, kind: str, payload: dict):
+    _ensure_heartbeat()
+
+    with _active_lock:
+        _active.add(job_id)
+
+    _executor.submit(_execute, job_id, kind, payload)
+
+
+def _execute(job_id: str, kind: str, payload: dict):
+    try:
+        _run(job_id, kind, payload)
+    finally:
+        with _active_lock:
+            _active.discard(job_id)
+
+
+def _run(job_id: str, kind: str, payload: dict):
+    try:
+        store.mark_running(job_id)
+        result = HANDLERS[kind](job_id, payload)
+        store.mark_succeeded(job_id, result)
+        logger.info("Job %s (%s) succeeded", job_id, kind)
+
+    except Exception as exc:
+        logger.exception("Job %s (%s) failed: %s", job_id, kind, exc)
+        try:
+            store.mark_failed(job_id, str(exc))
+        except Exception:
+            logger.exception("Could not record failure for job %s", job_id)
+
+
+def submit(kind: str, payload: dict) -> str:
+    """Record a queued job and hand it to this replica's worker pool."""
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    job_id = store.create_job(kind, payload)
+    _enqueue(job_id, kind, payload)
+    return job_id
+
+
+def recover_stale_jobs():
+    """
+    Take over queued/running jobs whose worker stopped sending heartbeats
+    (any replica, including this one), or fail them once they used
+    JOB_MAX_ATTEMPTS runs.
+    """
+    try:
+        jobs = store.recover_stale_jobs(JOB_STALE_SECONDS, JOB_MAX_ATTEMPTS)
+    except Exception:
+        logger.exception("Stale job recovery failed")
+        return
+
+    for job_id, kind, payload in jobs:
+        if kind not in HANDLERS:
+            store.mark_failed(job_id, f"Unknown job kind: {kind}")
+            continue
+
+        with _active_lock:
+            # Still ours (only its heartbeat writes failed): already running
+            if job_id in _active:
+                continue
+
+        logger.info("Re-queuing stale job %s (%s)", job_id, kind)
+        _enqueue(job_id, kind, payload)
+
+
+def _recovery_loop():
+    while True:
+        recover_stale_jobs()
+        time.sleep(JOB_STALE_SECONDS)
+
+
+def start_recovery():
+    """
+    Sweep for stale jobs now and then every JOB_STALE_SECONDS, so a job
+    lost while this process keeps running is picked up without a restart.
+    """
+    global _recovery_thread
+
+    with _active_lock:
+        if _recovery_thread is None:
+            _recovery_thread = threading.Thread(target=_recovery_loop, name="job-recovery", daemon=True)
+            _recovery_thread.start()
@@ -0,0 +1,221 @@
+import uuid
+import socket
+from psycopg2.extras import Json
+from pg_pool import get_cursor
+
+# ==============================
+# JOB TABLE
+# ==============================
+
+# Job rows live in Postgres so any replica can answer a status call,
+# whichever one is actually running the job.
+
+CREATE_JOBS_TABLE = """
+    CREATE TABLE IF NOT EXISTS ai_jobs (
+        id UUID PRIMARY KEY,
+        kind TEXT NOT NULL,
+        status TEXT NOT NULL,
+        payload JSONB NOT NULL,
+        progress JSONB,
+        result JSONB,
+        error TEXT,
+        worker TEXT,
+        attempts INT NOT NULL DEFAULT 0,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        started_at TIMESTAMPTZ,
+        finished_at TIMESTAMPTZ,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+    ALTER TABLE ai_jobs ADD COLUMN IF NOT EXISTS attempts INT NOT NULL DEFAULT 0;
+"""
+
+WORKER_NAME = socket.gethostname()
+
+_table_ready = False
+
+
+def _cursor():
+    global _table_ready
+
+    cursor, conn = get_cursor()
+
+    if not _table_ready:
+        try:
+            cursor.execute(CREATE_JOBS_TABLE)
+        except Exception:
+            conn.close()
+            raise
+
+        _table_ready = True
+
+    return cursor, conn
+
+
+def create_job(kind: str, payload: dict) -> str:
+    job_id = str(uuid.uuid4())
+    cursor, conn = _cursor()
+
+    try:
+        cursor.execute(
+            """
+            INSERT INTO ai_jobs (id, kind, status, payload, worker)
+            VALUES (%s, %s, 'queued', %s, %s)
+            """,
+            (job_id, kind, Json(payload), WORKER_NAME)
+        )
+    finally:
+        conn.close()
+
+    return job_id
+
+
+def mark_running(job_id: str):
+    _update(
+        job_id,
+        "status = 'running', started_at = now(), worker = %s, attempts = attempts + 1",
+        WORKER_NAME
+    )
+
+
+def set_progress(job_id: str, progress: dict):
+    _update(job_id, "progress = %s", Json(progress))
+
+
+def mark_succeeded(job_id: str, result: dict):
+    _update(
+        job_id,
+        "status = 'succeeded', result = %s, finished_at = now()",
+        Json(result)
+    )
+
+
+def mark_failed(job_id: str, error: str):
+    _update(
+        job_id,
+        "status = 'failed', error = %s, finished_at = now()",
+        error
+    )
+
+
+# ==============================
+# HEARTBEAT / RECOVERY
+# ==============================
+
+# updated_at doubles as the heartbeat of queued and running jobs; a job
+# whose heartbeat stops was lost with the process that held it
+
+def heartbeat(job_ids):
+    if not job_ids:
+        return
+
+    cursor, conn = _cursor()
+
+    try:
+        cursor.execute(
+            """
+            UPDATE ai_jobs SET updated_at = now()
+            WHERE id = ANY(%s::uuid[]) AND status IN ('queued', 'running')
+            """,
+            (list(job_ids),)
+        )
+    finally:
+        conn.close()
+
+
+def recover_stale_jobs(stale_seconds: float, max_attempts: int):
+    """
+    Fail the stale jobs that already used `max_attempts` runs, and claim
+    the other stale ones for this worker (re-queued, heartbeat reset).
+    Rows are claimed with FOR UPDATE SKIP LOCKED, so two replicas starting
+    together never take the same job. Returns (id, kind, payload) tuples.
+    """
+    cursor, conn = _cursor()
+
+    try:
+        cursor.execute(
+            """
+            UPDATE ai_jobs
+            SET status = 'failed',
+                error = 'Worker lost while running the job',
+                finished_at = now(),
+                updated_at = now()
+            WHERE id IN (
+                SELECT id FROM ai_jobs
+                WHERE status IN ('queued', 'running')
+                AND updated_at < now() - make_interval(secs => %s)
+                AND attempts >= %s
+                FOR UPDATE SKIP LOCKED
+            )
+            """,
+            (stale_seconds, max_attempts)
+        )
+
+        cursor.execute(
+            """
+            UPDATE ai_jobs
+            SET status = 'queued',
+                worker = %s,
+                started_at = NULL,
+                updated_at = now()
+            WHERE id IN (
+                SELECT id FROM ai_jobs
+                WHERE status IN ('queued', 'running')
+                AND updated_at < now() - make_interval(secs => %s)
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, kind, payload
+            """,
+            (WORKER_NAME, stale_seconds)
+        )
+
+        return [(str(row[0]), row[1], row[2]) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def _update(job_id: str, assignments: str, *values):
+    cursor, conn = _cursor()
+
+    try:
+        cursor.execute(
+            f"UPDATE ai_jobs SET {assignments}, updated_at = now() WHERE id = %s",
+            (*values, job_id)
+        )
+    finally:
+        conn.close()
+
+
+def get_job(job_id: str):
+    cursor, conn = _cursor()
+
+    try:
+        cursor.execute(
+            """
+            SELECT id, kind, status, progress, result, error, worker,
+                   created_at, started_at, finished_at, updated_at, attempts
+            FROM ai_jobs
+            WHERE id = %s
+            """,
+            (job_id,)
+        )
+        row = cursor.fetchone()
+    finally:
+        conn.close()
+
+    if not row:
+        return None
+
+    return {
+        "jobId": str(row[0]),
+        "kind": row[1],
+        "status": row[2],
+        "progress": row[3],
+        "result": row[4],
+        "error": row[5],
+        "worker": row[6],
+        "createdAt": row[7],
+        "startedAt": row[8],
+        "finishedAt": row[9],
+        "updatedAt": row[10],
+        "attempts": row[11],
+    }
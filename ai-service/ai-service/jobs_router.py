@@ -0,0 +1,90 @@
+import uuid
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+from typing import List, Optional
+
+from intent_engine.app.routes.search_routes import SearchRequest, validate_request
+from jobs import runner, store
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Jobs"]
+)
+
+# ==============================
+# REQUEST MODELS
+# ==============================
+
+class PlatformRunRequest(BaseModel):
+    userId: str
+    keywords: Optional[List[str]] = None
+
+
+def _accepted(job_id: str):
+    return {
+        "status": "queued",
+        "jobId": job_id,
+        "statusUrl": f"/jobs/{job_id}"
+    }
+
+
+# ==============================
+# SUBMIT
+# ==============================
+
+@router.post("/intent-search", status_code=202)
+def submit_intent_search(request: SearchRequest, min_intent: int = Query(0)):
+    validate_request(request)
+
+    job_id = runner.submit("intent_search", {
+        "request": request.model_dump(),
+        "min_intent": min_intent,
+    })
+    return _accepted(job_id)
+
+
+@router.post("/reddit-run", status_code=202)
+def submit_reddit_run(payload: PlatformRunRequest):
+    if not payload.userId:
+        raise HTTPException(status_code=400, detail="Missing userId")
+
+    if not payload.keywords:
+        raise HTTPException(status_code=400, detail="No keywords provided")
+
+    job_id = runner.submit("reddit_run", {
+        "userId": payload.userId,
+        "keywords": payload.keywords,
+    })
+    return _accepted(job_id)
+
+
+@router.post("/quora-run", status_code=202)
+def submit_quora_run(payload: PlatformRunRequest):
+    if not payload.userId:
+        raise HTTPException(status_code=400, detail="Missing userId")
+
+    job_id = runner.submit("quora_run", {
+        "userId": payload.userId,
+        # same default as /quora/run
+        "keywords": payload.keywords or ["startup", "crm", "lead", "generation"],
+    })
+    return _accepted(job_id)
+
+
+# ==============================
+# STATUS
+# ==============================
+
+@router.get("/{job_id}")
+def get_job_status(job_id: str):
+    try:
+        uuid.UUID(job_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    job = store.get_job(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job
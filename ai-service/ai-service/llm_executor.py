@@ -0,0 +1,168 @@
+import os
+import json
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import httpx
+
+# ==============================
+# CONFIG
+# ==============================
+
+# Reply generations running at once per pipeline run
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+
+# Hard limit for one completion, passed to the Mistral client as timeout_ms
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+
+# Retries after a 429 / 5xx / network error, with jittered exponential backoff
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "20"))
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Posts packed into one batched generation request
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "5"))
+
+
+# ==============================
+# RETRY
+# ==============================
+
+def _status_code(exc):
+    status = getattr(exc, "status_code", None)
+
+    if status is None and getattr(exc, "response", None) is not None:
+        status = getattr(exc.response, "status_code", None)
+
+    return status
+
+
+def is_retryable(exc) -> bool:
+    if isinstance(exc, (httpx.TimeoutException, httpx.TransportError)):
+        return True
+
+    return _status_code(exc) in RETRYABLE_STATUS
+
+
+def _retry_after(exc):
+    response = getattr(exc, "raw_response", None) or getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+
+    try:
+        return min(float(headers.get("Retry-After")), LLM_BACKOFF_MAX_SECONDS)
+    except (TypeError, ValueError):
+        return None
+
+
+def call_with_retry(fn, *args, **kwargs):
+    """
+    Call `fn`, retrying rate limits, server errors and timeouts.
+
+    Waits honour Retry-After when the error carries one, otherwise use
+    full-jitter exponential backoff. Other errors are raised at once.
+    """
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        try:
+            return fn(*args, **kwargs)
+
+        except Exception as exc:
+            if attempt == LLM_MAX_RETRIES or not is_retryable(exc):
+                raise
+
+            wait = _retry_after(exc)
+            if wait is None:
+                wait = random.uniform(0, min(LLM_BACKOFF_BASE_SECONDS * 2 ** attempt, LLM_BACKOFF_MAX_SECONDS))
+
+            print(f"⏳ LLM call failed ({_status_code(exc) or type(exc).__name__}), retry {attempt + 1} in {wait:.1f}s")
+            time.sleep(wait)
+
+
+# ==============================
+# BATCHED RESPONSES
+# ==============================
+
+def chunked(items, size=None):
+    size = max(1, size or LLM_BATCH_SIZE)
+    items = list(items)
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def parse_batch_replies(raw: str):
+    """
+    Reply options per post id from a batched JSON answer shaped like
+    {"replies": [{"id": "1", "options": ["...", "..."]}]}.
+
+    Tolerates code fences or prose around the object; entries whose
+    options are not a non-empty list of non-empty strings are left out.
+    """
+    if not raw:
+        return {}
+
+    start, end = raw.find("{"), raw.rfind("}")
+    if start == -1 or end <= start:
+        return {}
+
+    try:
+        data = json.loads(raw[start:end + 1])
+    except ValueError:
+        return {}
+
+    if not isinstance(data, dict):
+        return {}
+
+    parsed = {}
+
+    for entry in data.get("replies") or []:
+        if not isinstance(entry, dict):
+            continue
+
+        options = entry.get("options")
+
+        # Anything but a list of non-empty strings (e.g. one bare string,
+        # which would iterate per character) leaves the post to the retry path
+        if not isinstance(options, list) or not options:
+            continue
+
+        if not all(isinstance(option, str) and option.strip() for option in options):
+            continue
+
+        if entry.get("id") is not None:
+            parsed[str(entry["id"])] = [option.strip() for option in options]
+
+    return parsed
+
+
+# ==============================
+# BOUNDED EXECUTION
+# ==============================
+
+def run_bounded(items, work, on_result, concurrency=None):
+    """
+    Run `work(item)` for every item, at most `concurrency` at a time, and
+    call `on_result(item, result)` in the caller's thread as each one
+    finishes, so one slow completion never holds back the others.
+
+    A failing item is reported to `on_result` with result None.
+    """
+    items = list(items)
+    if not items:
+        return
+
+    workers = max(1, min(concurrency or LLM_CONCURRENCY, len(items)))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm") as executor:
+        futures = {executor.submit(work, item): item for item in items}
+
+        for future in as_completed(futures):
+            item = futures[future]
+
+            try:
+                result = future.result()
+            except Exception as e:
+                print("❌ Generation error:", e)
+                result = None
+
+            on_result(item, result)
@@ -1,7 +1,10 @@
+import warmup
+
 from api import app
 
 # 🔥 ADD CORS HERE (IMPORTANT)
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,17 +19,42 @@ app.add_middleware(
 )
 
 # 🔥 IMPORT ROUTES
-from intent_engine.app.routes import lead_routes, search_routes
+from intent_engine.app.routes import lead_routes, search_routes, admin_routes
+from jobs_router import router as jobs_router
 
 # 🔥 REGISTER ROUTES
 app.include_router(lead_routes.router, prefix="/intent")
 app.include_router(search_routes.router, prefix="/intent")
+app.include_router(admin_routes.router, prefix="/intent")
+app.include_router(jobs_router)
+
+
+warmup.mark_imported()
+
+
+# 🔥 LOAD MODELS + INTENT INDEX IN THE BACKGROUND (SEE /ready)
+@app.on_event("startup")
+def start_warmup():
+    warmup.start_warmup()
+
+# 🔥 PICK UP JOBS LOST BY A RESTART / CRASH (PERIODIC SWEEP)
+@app.on_event("startup")
+def recover_jobs():
+    from jobs import runner
+
+    runner.start_recovery()
 
 # 🔥 OPTIONAL HEALTH CHECK (GOOD PRACTICE)
 @app.get("/health")
 def health():
     return {"status": "AI service running"}
 
+# 🔥 READINESS: 503 UNTIL THE INTENT MODEL IS LOADED
+@app.get("/ready")
+def ready():
+    status = warmup.readiness()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
 # 🔥 RUN SERVER
 if __name__ == "__main__":
     import os
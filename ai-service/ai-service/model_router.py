@@ -0,0 +1,188 @@
+import os
+import time
+import threading
+
+from llm_executor import call_with_retry, LLM_TIMEOUT_SECONDS
+from token_budget import log_usage
+
+# ==============================
+# CONFIG
+# ==============================
+
+# Small, fast model for ordinary posts and the larger one for posts worth it
+REPLY_MODEL_SMALL = os.getenv("REPLY_MODEL_SMALL", "open-mistral-7b")
+REPLY_MODEL_LARGE = os.getenv("REPLY_MODEL_LARGE", "mistral-small-latest")
+
+# "intent" routes each post by its intent score; "small" or "large" sends
+# everything to one tier
+REPLY_ROUTING = os.getenv("REPLY_ROUTING", "intent")
+
+# Posts scoring at least this on analyze_intent (60 = Medium Intent) go large
+REPLY_ESCALATE_MIN_INTENT = int(os.getenv("REPLY_ESCALATE_MIN_INTENT", "60"))
+
+# Retry on the large model when the small one's answer cannot be parsed
+REPLY_ESCALATE_ON_PARSE_FAILURE = os.getenv("REPLY_ESCALATE_ON_PARSE_FAILURE", "1") == "1"
+
+# USD per million tokens (input, output), for the cost counters only;
+# keep in line with Mistral's price list
+TIERS = {
+    "small": {
+        "model": REPLY_MODEL_SMALL,
+        "price_in": float(os.getenv("REPLY_MODEL_SMALL_PRICE_IN", "0.25")),
+        "price_out": float(os.getenv("REPLY_MODEL_SMALL_PRICE_OUT", "0.25")),
+    },
+    "large": {
+        "model": REPLY_MODEL_LARGE,
+        "price_in": float(os.getenv("REPLY_MODEL_LARGE_PRICE_IN", "1.0")),
+        "price_out": float(os.getenv("REPLY_MODEL_LARGE_PRICE_OUT", "3.0")),
+    },
+}
+
+# Changes whenever routing would pick differently, so cached replies made
+# under other rules are not served
+ROUTING_KEY = f"{REPLY_ROUTING}:{REPLY_MODEL_SMALL}:{REPLY_MODEL_LARGE}:{REPLY_ESCALATE_MIN_INTENT}"
+
+# ==============================
+# ROUTING
+# ==============================
+
+def _intent_scores(texts):
+    from intent_engine.app.services.intent_service import analyze_intents
+
+    return [analysis.get("intent_score") or 0 for analysis in analyze_intents(texts)]
+
+
+def choose_tiers(texts):
+    """
+    Tier per text, in order: "large" for posts at or above
+    REPLY_ESCALATE_MIN_INTENT, "small" for the rest. Scored in one
+    analyze_intents call; if scoring fails everything goes small.
+    """
+    texts = list(texts)
+
+    if REPLY_ROUTING in TIERS:
+        return [REPLY_ROUTING] * len(texts)
+
+    if not texts:
+        return []
+
+    try:
+        scores = _intent_scores(texts)
+    except Exception as e:
+        print("⚠️ Intent routing failed, using the small model:", e)
+        return ["small"] * len(texts)
+
+    return ["large" if score >= REPLY_ESCALATE_MIN_INTENT else "small" for score in scores]
+
+
+def choose_tier(text):
+    return choose_tiers([text])[0]
+
+
+def should_escalate(tier):
+    return tier == "small" and REPLY_ESCALATE_ON_PARSE_FAILURE
+
+
+def model_for(tier):
+    return TIERS[tier]["model"]
+
+
+# ==============================
+# COUNTERS
+# ==============================
+
+_lock = threading.Lock()
+
+_counters = {
+    tier: {
+        "calls": 0,
+        "errors": 0,
+        "escalations": 0,
+        "latency_ms": 0.0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cost_usd": 0.0,
+    }
+    for tier in TIERS
+}
+
+
+def record(tier, latency_ms, usage=None, error=False):
+    prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+    completion_tokens = getattr(usage, "completion_tokens", None) or 0
+    price = TIERS[tier]
+
+    with _lock:
+        counters = _counters[tier]
+        counters["calls"] += 1
+        counters["errors"] += int(error)
+        counters["latency_ms"] += latency_ms
+        counters["prompt_tokens"] += prompt_tokens
+        counters["completion_tokens"] += completion_tokens
+        counters["cost_usd"] += (
+            prompt_tokens * price["price_in"] + completion_tokens * price["price_out"]
+        ) / 1_000_000
+
+
+def record_escalation(reason):
+    """Count one small-model answer redone on the large model."""
+    print(f"⬆️ Escalating to {REPLY_MODEL_LARGE}: {reason}")
+
+    with _lock:
+        _counters["small"]["escalations"] += 1
+
+
+def stats():
+    with _lock:
+        tiers = {}
+
+        for tier, counters in _counters.items():
+            calls = counters["calls"]
+
+            tiers[tier] = {
+                **counters,
+                "model": TIERS[tier]["model"],
+                "latency_ms": round(counters["latency_ms"]),
+                "avg_latency_ms": round(counters["latency_ms"] / calls) if calls else None,
+                "cost_usd": round(counters["cost_usd"], 6),
+            }
+
+    return {
+        "routing": REPLY_ROUTING,
+        "escalate_min_intent": REPLY_ESCALATE_MIN_INTENT,
+        "escalate_on_parse_failure": REPLY_ESCALATE_ON_PARSE_FAILURE,
+        "tiers": tiers,
+    }
+
+
+# ==============================
+# COMPLETION
+# ==============================
+
+def complete(client, tier, label, messages, **kwargs):
+    """
+    One chat completion on `tier`'s model (with retries and the usual
+    timeout), logged and counted against that tier. Returns the content.
+    """
+    model = model_for(tier)
+    started = time.perf_counter()
+
+    try:
+        response = call_with_retry(
+            client.chat.complete,
+            model=model,
+            messages=messages,
+            timeout_ms=int(LLM_TIMEOUT_SECONDS * 1000),
+            **kwargs
+        )
+    except Exception:
+        record(tier, (time.perf_counter() - started) * 1000, error=True)
+        raise
+
+    latency_ms = (time.perf_counter() - started) * 1000
+    usage = getattr(response, "usage", None)
+
+    log_usage(f"{label}.{tier}", model, "\n".join(m["content"] for m in messages), usage, latency_ms)
+    record(tier, latency_ms, usage)
+
+    return response.choices[0].message.content
@@ -0,0 +1,309 @@
+import os
+import time
+import logging
+import weakref
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import extensions
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# ==============================
+# CONFIG
+# ==============================
+
+# Hard cap on open connections for the whole process (all routers, jobs
+# and pipelines share them)
+PG_POOL_MAX_SIZE = int(os.getenv("PG_POOL_MAX_SIZE", "10"))
+
+# Connections kept open while idle; the rest are closed on release
+PG_POOL_MIN_IDLE = int(os.getenv("PG_POOL_MIN_IDLE", "1"))
+
+# How long a caller waits for a free connection before giving up
+PG_POOL_TIMEOUT_SECONDS = float(os.getenv("PG_POOL_TIMEOUT_SECONDS", "30"))
+
+# Connections are replaced after this long, so server-side state and
+# Neon proxy sessions never get old
+PG_POOL_MAX_LIFETIME_SECONDS = float(os.getenv("PG_POOL_MAX_LIFETIME_SECONDS", "1800"))
+
+# Idle connections above PG_POOL_MIN_IDLE are closed after this long
+PG_POOL_MAX_IDLE_SECONDS = float(os.getenv("PG_POOL_MAX_IDLE_SECONDS", "300"))
+
+# A connection idle for longer than this is pinged before being handed out
+# (Neon drops idle connections when its compute scales to zero)
+PG_POOL_HEALTHCHECK_AFTER_SECONDS = float(os.getenv("PG_POOL_HEALTHCHECK_AFTER_SECONDS", "30"))
+
+
+class PoolTimeout(RuntimeError):
+    pass
+
+
+# ==============================
+# POOLED CONNECTION
+# ==============================
+
+class PooledConnection:
+    """
+    psycopg2 connection on loan from the pool.
+
+    Behaves like the raw connection; `close()` hands it back to the pool
+    instead of closing the socket, so existing `conn.close()` call sites
+    keep working unchanged. A connection dropped without `close()` is
+    closed and its slot freed when it is garbage collected.
+    """
+
+    def __init__(self, pool, raw, created_at):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_raw", raw)
+        object.__setattr__(self, "_created_at", created_at)
+        object.__setattr__(self, "_finalizer", weakref.finalize(self, pool._reclaim, raw))
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._raw, name, value)
+
+    def close(self):
+        # detach() is truthy only the first time, so close() is idempotent
+        if self._finalizer.detach():
+            self._pool._release(self._raw, self._created_at)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# ==============================
+# POOL
+# ==============================
+
+class ConnectionPool:
+
+    def __init__(self, dsn=None):
+        self._dsn = dsn
+        self._cond = threading.Condition()
+
+        # (raw connection, created_at, idle_since)
+        self._idle = deque()
+        self._size = 0
+
+        self._counters = {
+            "acquired": 0,
+            "created": 0,
+            "closed": 0,
+            "recycled": 0,
+            "leaked": 0,
+            "health_check_failures": 0,
+            "timeouts": 0,
+            "waits": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def _connect(self):
+        dsn = self._dsn or os.getenv("DATABASE_URL")
+        if not dsn:
+            raise RuntimeError("DATABASE_URL is not set. Check ai-service/.env")
+
+        raw = psycopg2.connect(dsn)
+        raw.autocommit = True
+        return raw
+
+    def _discard(self, raw, counter="closed"):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+        with self._cond:
+            self._size -= 1
+            self._counters[counter] += 1
+            self._cond.notify()
+
+    def _reclaim(self, raw):
+        # Its transaction state is unknown, so the connection is closed
+        # rather than reused
+        logger.warning("Pooled Postgres connection was never closed; discarding it")
+        self._discard(raw, "leaked")
+
+    def _healthy(self, raw, idle_since):
+        if raw.closed:
+            return False
+
+        if time.time() - idle_since < PG_POOL_HEALTHCHECK_AFTER_SECONDS:
+            return True
+
+        try:
+            with raw.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except Exception as exc:
+            logger.warning("Pooled Postgres connection failed its health check: %s", exc)
+            return False
+
+    def _take(self, deadline):
+        """Reserve an idle connection or a slot for a new one."""
+        waited_since = None
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    return self._idle.pop(), waited_since
+
+                if self._size < PG_POOL_MAX_SIZE:
+                    self._size += 1
+                    return None, waited_since
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"No Postgres connection free after {PG_POOL_TIMEOUT_SECONDS}s "
+                        f"({PG_POOL_MAX_SIZE} in use)"
+                    )
+
+                if waited_since is None:
+                    waited_since = time.monotonic()
+                self._cond.wait(remaining)
+
+    def _record_wait(self, waited_since):
+        with self._cond:
+            self._counters["acquired"] += 1
+
+            if waited_since is not None:
+                waited = time.monotonic() - waited_since
+                self._counters["waits"] += 1
+                self._counters["wait_seconds_total"] += waited
+                self._counters["wait_seconds_max"] = max(self._counters["wait_seconds_max"], waited)
+
+    def acquire(self, timeout=None):
+        deadline = time.monotonic() + (PG_POOL_TIMEOUT_SECONDS if timeout is None else timeout)
+
+        while True:
+            idle, waited_since = self._take(deadline)
+
+            if idle is None:
+                try:
+                    raw = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+
+                with self._cond:
+                    self._counters["created"] += 1
+
+                self._record_wait(waited_since)
+                return PooledConnection(self, raw, time.time())
+
+            raw, created_at, idle_since = idle
+
+            if time.time() - created_at >= PG_POOL_MAX_LIFETIME_SECONDS:
+                self._discard(raw, "recycled")
+                continue
+
+            if not self._healthy(raw, idle_since):
+                self._discard(raw, "health_check_failures")
+                continue
+
+            self._record_wait(waited_since)
+            return PooledConnection(self, raw, created_at)
+
+    def _release(self, raw, created_at):
+        if raw.closed:
+            self._discard(raw)
+            return
+
+        try:
+            # Callers may have switched to explicit transactions
+            if raw.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                raw.rollback()
+            if not raw.autocommit:
+                raw.autocommit = True
+        except Exception:
+            self._discard(raw)
+            return
+
+        if time.time() - created_at >= PG_POOL_MAX_LIFETIME_SECONDS:
+            self._discard(raw, "recycled")
+            return
+
+        now = time.time()
+
+        with self._cond:
+            self._idle.append((raw, created_at, now))
+            expired = self._expired_idle(now)
+            self._cond.notify()
+
+        for stale in expired:
+            self._discard(stale)
+
+    def _expired_idle(self, now):
+        # Oldest idle connections sit at the left of the deque
+        expired = []
+
+        while len(self._idle) > PG_POOL_MIN_IDLE and now - self._idle[0][2] >= PG_POOL_MAX_IDLE_SECONDS:
+            expired.append(self._idle.popleft()[0])
+
+        return expired
+
+    def stats(self):
+        with self._cond:
+            return {
+                **self._counters,
+                "wait_seconds_total": round(self._counters["wait_seconds_total"], 3),
+                "wait_seconds_max": round(self._counters["wait_seconds_max"], 3),
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": PG_POOL_MAX_SIZE,
+            }
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+
+        for raw, _, _ in idle:
+            self._discard(raw)
+
+
+# ==============================
+# SHARED POOL
+# ==============================
+
+pool = ConnectionPool()
+
+
+def get_connection(timeout=None):
+    """Autocommit connection from the shared pool; `close()` returns it."""
+    return pool.acquire(timeout)
+
+
+def get_cursor():
+    """Return a (cursor, conn) tuple. Caller must close the connection."""
+    conn = get_connection()
+    return conn.cursor(), conn
+
+
+@contextmanager
+def cursor():
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            yield cur
+    finally:
+        conn.close()
+
+
+def stats():
+    return pool.stats()
@@ -2,13 +2,30 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import os
-from mistralai import Mistral
+
+import model_router
+from llm_executor import parse_batch_replies
+from token_budget import compact, POST_TOKEN_BUDGET, REPLY_MAX_TOKENS
 
 api_key = os.getenv("MISTRAL_API_KEY")
-if not api_key:
-    raise ValueError("MISTRAL_API_KEY not found")
 
-client = Mistral(api_key=api_key)
+# Created on first use so importing the router stays cheap
+client = None
+
+
+def get_client():
+    global client
+
+    if client is None:
+        if not api_key:
+            raise ValueError("MISTRAL_API_KEY not found")
+
+        from mistralai import Mistral
+
+        client = Mistral(api_key=api_key)
+
+    return client
+
 
 SYSTEM_PROMPT = (
     "You are a real human answering questions on Quora. "
@@ -22,7 +39,10 @@ SYSTEM_PROMPT = (
     "Your tone is neutral, helpful, and non-commercial."
 )
 
-def generate_replies(text, platform="quora"):
+def generate_replies(text, platform="quora", tier=None):
+    # Small model unless the question is high-intent
+    tier = tier or model_router.choose_tier(text)
+
     messages = [
         {
             "role": "system",
@@ -34,7 +54,7 @@ def generate_replies(text, platform="quora"):
         {
             "role": "user",
             "content": (
-                f"Post:\n{text}\n\n"
+                f"Post:\n{compact(text, POST_TOKEN_BUDGET)}\n\n"
                 "Write exactly two reply options.\n"
                 "Format strictly like this:\n"
                 "1. <reply one>\n"
@@ -44,22 +64,112 @@ def generate_replies(text, platform="quora"):
         }
     ]
 
-    response = client.chat.complete(
-        model="open-mistral-7b",
-        messages=messages,
-        temperature=0.7
-    )
-
-    raw = response.choices[0].message.content.strip()
+    raw = model_router.complete(
+        get_client(),
+        tier,
+        "quora.single",
+        messages,
+        temperature=0.7,
+        max_tokens=REPLY_MAX_TOKENS
+    ).strip()
 
     replies = []
     for line in raw.split("\n"):
         if line.strip().startswith(("1.", "2.")):
             replies.append(line.split(".", 1)[1].strip())
 
+    if len(replies) < 2 and model_router.should_escalate(tier):
+        model_router.record_escalation("unparseable reply")
+        return generate_replies(text, platform, tier="large")
+
     # Safety fallback
     if len(replies) < 2:
         replies = [r.strip() for r in raw.split("\n") if r.strip()][:2]
 
     return replies
 
+
+def generate_replies_batch(posts, platform="quora"):
+    """
+    Two replies each for several posts ({"id", "text"} dicts) from one
+    JSON-mode request per model tier; posts missing from an answer fall
+    back to their own generate_replies call. Returns {post id: replies}.
+    """
+    posts = [post for post in posts if post.get("text")]
+
+    by_tier = {}
+    for post, tier in zip(posts, model_router.choose_tiers(post["text"] for post in posts)):
+        by_tier.setdefault(tier, []).append(post)
+
+    results = {}
+
+    for tier, tier_posts in by_tier.items():
+        results.update(_generate_tier_batch(tier_posts, platform, tier))
+
+    return results
+
+
+def _generate_tier_batch(posts, platform, tier):
+    if len(posts) == 1:
+        return {posts[0]["id"]: generate_replies(posts[0]["text"], platform, tier)}
+
+    listing = "\n\n".join(
+        f"[{number}]\n{compact(post['text'], POST_TOKEN_BUDGET)}"
+        for number, post in enumerate(posts, start=1)
+    )
+
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "You are a human replying on social media. "
+                "Replies must be short (1–2 lines), natural, non-promotional."
+            )
+        },
+        {
+            "role": "user",
+            "content": (
+                f"Posts (each starts with its number in brackets):\n\n{listing}\n\n"
+                "Write exactly two reply options for EVERY post.\n"
+                "Return only JSON in this shape:\n"
+                '{"replies": [{"id": "<post number>", "options": ["<reply one>", "<reply two>"]}]}'
+            )
+        }
+    ]
+
+    try:
+        parsed = parse_batch_replies(model_router.complete(
+            get_client(),
+            tier,
+            "quora.batch",
+            messages,
+            temperature=0.7,
+            max_tokens=REPLY_MAX_TOKENS * len(posts),
+            response_format={"type": "json_object"}
+        ))
+    except Exception as e:
+        print("❌ Batch generation error:", e)
+        parsed = {}
+
+    results = {}
+
+    for number, post in enumerate(posts, start=1):
+        replies = parsed.get(str(number), [])[:2]
+
+        if len(replies) < 2:
+            print("↩️ Batch missed a post, generating it alone:", post["text"][:60])
+
+            retry_tier = tier
+            if model_router.should_escalate(tier):
+                model_router.record_escalation("post missing from batch answer")
+                retry_tier = "large"
+
+            try:
+                replies = generate_replies(post["text"], platform, retry_tier)
+            except Exception as e:
+                print("❌ Generation error:", e)
+                replies = []
+
+        results[post["id"]] = replies
+
+    return results
@@ -1,22 +1,8 @@
-import os
-import psycopg2
 from dotenv import load_dotenv
 
 load_dotenv()
 
-
-def get_connection():
-    """Create and return a new DB connection."""
-    db_url = os.getenv("DATABASE_URL")
-    if not db_url:
-        raise RuntimeError("DATABASE_URL not set in environment")
-
-    conn = psycopg2.connect(db_url)
-    conn.autocommit = True
-    return conn
-
-
-def get_cursor():
-    """Return a (cursor, conn) tuple. Caller must close the connection."""
-    conn = get_connection()
-    return conn.cursor(), conn
+# get_connection() / get_cursor() hand out autocommit connections from the
+# process-wide pool shared with the Reddit side; the caller still closes
+# the connection, which returns it to the pool.
+from pg_pool import get_connection, get_cursor  # noqa: E402,F401
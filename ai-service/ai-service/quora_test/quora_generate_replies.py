@@ -1,12 +1,12 @@
 from quora_test.db.neon import get_cursor
-from quora_test.ai.reply_generator import generate_replies
+from quora_test.ai.reply_generator import generate_replies_batch
+from llm_executor import run_bounded, chunked
 
 MAX_REPLIES_PER_RUN = 5  # 🔥 match scraper limit
 
 
-def generate_quora_replies(user_id: str):
+def _load_posts(user_id: str):
     cursor, conn = get_cursor()
-    inserted_replies = 0
 
     try:
         cursor.execute("""
@@ -20,29 +20,58 @@ def generate_quora_replies(user_id: str):
             LIMIT %s
         """, (user_id, MAX_REPLIES_PER_RUN))
 
-        posts = cursor.fetchall()
+        return cursor.fetchall()
 
-        if not posts:
-            print("⚠️ No new Quora posts found.")
-            return 0
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
 
-        for post_id, question, url, author in posts:
-            question = (question or "").strip()
 
-            if not question:
-                continue
+def generate_quora_replies(user_id: str):
+    inserted_replies = 0
 
+    # Returned to the pool before the (slow) LLM run; each insert takes
+    # its own short-lived connection
+    posts = _load_posts(user_id)
+
+    if not posts:
+        print("⚠️ No new Quora posts found.")
+        return 0
+
+    posts = [
+        (post_id, (question or "").strip())
+        for post_id, question, url, author in posts
+        if (question or "").strip()
+    ]
+
+    # Posts are sent in batches (one request each); batches run
+    # concurrently and each answer is stored (autocommit) as soon as
+    # its batch arrives
+    def generate(batch):
+        for _, question in batch:
             print("🧠 Generating replies for:", question[:70])
 
-            replies = generate_replies(
-                text=question,
-                platform="quora"
-            )
+        return generate_replies_batch(
+            [{"id": post_id, "text": question} for post_id, question in batch],
+            platform="quora"
+        )
 
-            if not replies or len(replies) < 2:
-                print("⚠️ AI did not return enough replies")
-                continue
+    def store_post(post_id, replies):
+        nonlocal inserted_replies
 
+        if not replies or len(replies) < 2:
+            print("⚠️ AI did not return enough replies")
+            return
+
+        try:
+            cursor, conn = get_cursor()
+        except Exception as e:
+            print("❌ Reply insert error:", e)
+            return
+
+        try:
             cursor.execute(
                 """
                 INSERT INTO quora_ai_replies
@@ -56,22 +85,20 @@ def generate_quora_replies(user_id: str):
                     False
                 )
             )
+        except Exception as e:
+            print("❌ Reply insert error:", e)
+            return
+        finally:
+            conn.close()
 
-            try:
-                if cursor.rowcount and cursor.rowcount > 0:
-                    inserted_replies += 1
-                else:
-                    inserted_replies += 1
-            except Exception:
-                inserted_replies += 1
+        inserted_replies += 1
+        print("✅ Replies stored")
 
-            print("✅ Replies stored")
+    def store(batch, results):
+        for post_id, _ in batch:
+            store_post(post_id, (results or {}).get(post_id))
 
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+    run_bounded(chunked(posts), generate, store)
 
     print(f"🎉 Quora reply generation complete — inserted {inserted_replies} replies (MAX {MAX_REPLIES_PER_RUN})")
-    return inserted_replies
\ No newline at end of file
+    return inserted_replies
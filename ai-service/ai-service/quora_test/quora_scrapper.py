@@ -1,17 +1,21 @@
 import os
 import requests
 from urllib.parse import quote_plus
+from psycopg2.extras import execute_values
 from quora_test.db.neon import get_cursor
 
 
 SERPAPI_KEY = os.getenv("SERPAPI_KEY")
 
+# Optional cap on new questions stored per run (already-stored urls don't
+# count); 0 keeps every new result
+QUORA_MAX_POSTS_PER_RUN = int(os.getenv("QUORA_MAX_POSTS_PER_RUN", "0"))
+
 
 def scrape_quora(user_id: str, keywords: list[str]):
     if not SERPAPI_KEY:
         raise RuntimeError("SERPAPI_KEY not set in environment")
 
-    cursor, conn = get_cursor()
     inserted = 0
 
     if not keywords:
@@ -43,46 +47,68 @@ def scrape_quora(user_id: str, keywords: list[str]):
         print("⚠️ No results returned from SerpAPI")
         return 0
 
+    # One row per url, in result order; existing urls are dropped up front
+    # so a cap only counts questions we don't have yet
+    candidates = {}
     for result in results:
-        try:
-            url = result.get("link")
-            title = result.get("title")
+        url = result.get("link")
+        title = result.get("title")
 
-            if not url or not title:
-                continue
+        if not url or not title:
+            continue
 
-            if "quora.com" not in url:
-                continue
+        if "quora.com" not in url:
+            continue
 
-            cursor.execute(
+        candidates.setdefault(url, title)
+
+    cursor, conn = get_cursor()
+
+    try:
+        cursor.execute(
+            "SELECT url FROM quora_posts WHERE url = ANY(%s)",
+            (list(candidates),)
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+
+        rows = [
+            (user_id, "quora", title, url, None)
+            for url, title in candidates.items()
+            if url not in existing
+        ]
+
+        if QUORA_MAX_POSTS_PER_RUN > 0:
+            rows = rows[:QUORA_MAX_POSTS_PER_RUN]
+
+        created = []
+        if rows:
+            created = execute_values(
+                cursor,
                 """
                 INSERT INTO quora_posts
                 (user_id, platform, question, url, author)
-                VALUES (%s, %s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT (url) DO NOTHING
+                RETURNING id, url
                 """,
-                (
-                    user_id,
-                    "quora",
-                    title,
-                    url,
-                    None
-                )
+                rows,
+                page_size=len(rows),
+                fetch=True
             )
 
-            conn.commit()
+        inserted = len(created)
 
-            if cursor.rowcount > 0:
-                inserted += 1
-                print("✅ INSERTED:", title)
+        for _, url in created:
+            print("✅ INSERTED:", candidates[url])
 
-        except Exception as e:
-            print("❌ Insert error:", e)
+    except Exception as e:
+        print("❌ Insert error:", e)
 
-    try:
-        conn.close()
-    except Exception:
-        pass
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
 
     print(f"🎉 Quora fetch finished — inserted {inserted} rows")
     return inserted
@@ -1,11 +1,22 @@
+import json
+import asyncio
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from psycopg2.extras import execute_values
 from typing import List, Optional
 
-from reddit_test.reddit_scrape_test import scrape_reddit
+from reddit_test.reddit_scrape_test import scrape_reddit_async
 from reddit_test.reddit_generate_replies import generate_reddit_replies
 from reddit_test.db.neon import get_cursor
-from reddit_test.ai.reply_generator import generate_replies
+from reddit_test.ai import reply_cache
+from reddit_test.ai import style_context
+from reddit_test.ai.reply_generator import (
+    get_or_generate_replies,
+    stream_replies,
+    MODEL_KEY,
+    PROMPT_VERSION,
+)
 
 router = APIRouter(
     prefix="/reddit",
@@ -25,6 +36,8 @@ class RedditRunRequest(BaseModel):
 class GenerateRequest(BaseModel):
     postId: str
     postText: Optional[str] = None
+    # Skip stored/cached replies and always ask the model again
+    regenerate: bool = False
 
 
 # ==============================
@@ -32,7 +45,7 @@ class GenerateRequest(BaseModel):
 # ==============================
 
 @router.post("/run")
-def run_reddit_pipeline(payload: RedditRunRequest):
+async def run_reddit_pipeline(payload: RedditRunRequest):
 
     try:
 
@@ -53,16 +66,17 @@ def run_reddit_pipeline(payload: RedditRunRequest):
 
         print(f"🚀 Starting Reddit pipeline for user: {payload.userId}")
 
-        # 1️⃣ SCRAPE
-        inserted = scrape_reddit(
+        # 1️⃣ SCRAPE (keywords fetched concurrently, no blocking sleeps)
+        inserted = await scrape_reddit_async(
             user_id=payload.userId,
             keywords=keywords
         )
 
         print(f"📥 Scraped posts inserted: {inserted}")
 
-        # 2️⃣ GENERATE
-        generate_reddit_replies(
+        # 2️⃣ GENERATE (blocking LLM calls stay off the event loop)
+        await asyncio.to_thread(
+            generate_reddit_replies,
             user_id=payload.userId
         )
 
@@ -70,7 +84,8 @@ def run_reddit_pipeline(payload: RedditRunRequest):
 
         return {
             "status": "success",
-            "message": "Reddit scraping and reply generation completed"
+            "message": "Reddit scraping and reply generation completed",
+            "insertedPosts": int(inserted or 0)
         }
 
     except HTTPException:
@@ -88,66 +103,128 @@ def run_reddit_pipeline(payload: RedditRunRequest):
 # SINGLE GENERATE (BUTTON)
 # ==============================
 
-@router.post("/generate")
-def generate_single_reply(payload: GenerateRequest):
+def _load_post(post_id: str):
+    """(text, url, stored replies) for a stored post, or None; one round-trip."""
+    cursor, conn = get_cursor()
+
+    try:
+        cursor.execute(
+            """
+            SELECT p.text, p.url,
+                   ARRAY(
+                       SELECT r.generated_reply
+                       FROM reddit_ai_replies r
+                       WHERE r.reddit_post_id = p.id
+                       ORDER BY r.id DESC
+                       LIMIT 2
+                   )
+            FROM reddit_posts p
+            WHERE p.id = %s
+            """,
+            (post_id,)
+        )
+
+        return cursor.fetchone()
+
+    finally:
+        cursor.close()
+        conn.close()
+
 
+def _store_replies(post_id: str, replies: List[str]):
     cursor, conn = get_cursor()
 
     try:
+        execute_values(cursor, """
+            INSERT INTO reddit_ai_replies
+            (reddit_post_id, intent, generated_reply)
+            VALUES %s
+        """, [
+            (post_id, "no_vector_rag", reply)
+            for reply in replies
+        ])
 
-        text = None
-        url = None
+        style_context.add(replies)
 
-        # ==============================
-        # FETCH POST FROM DB USING ID
-        # ==============================
+    except Exception as e:
+        # The replies are still returned; they just won't be served from the store
+        print("⚠️ Could not store generated replies:", e)
 
-        cursor.execute(
-            """
-            SELECT text, url
-            FROM reddit_posts
-            WHERE id = %s
-            """,
-            (payload.postId,)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def _resolve_text(post, payload: GenerateRequest):
+    if post:
+        text = post[0]
+    elif payload.postText:
+        print("⚠️ Post ID not found, using frontend text fallback")
+        text = payload.postText
+    else:
+        raise HTTPException(
+            status_code=404,
+            detail="Post not found"
+        )
+
+    text = (text or "").strip()
+
+    if not text:
+        raise HTTPException(
+            status_code=400,
+            detail="Empty post text"
         )
 
-        post = cursor.fetchone()
+    return text
+
+
+@router.post("/generate")
+def generate_single_reply(payload: GenerateRequest):
+
+    try:
 
         # ==============================
-        # FALLBACK → USE FRONTEND TEXT
+        # FETCH POST (+ STORED REPLIES) FROM DB USING ID
         # ==============================
 
-        if post:
-            text, url = post
-        elif payload.postText:
-            print("⚠️ Post ID not found, using frontend text fallback")
-            text = payload.postText
-            url = None
-        else:
-            raise HTTPException(
-                status_code=404,
-                detail="Post not found"
-            )
+        post = _load_post(payload.postId)
 
-        text = (text or "").strip()
+        # ==============================
+        # READ-THROUGH: REPLIES ALREADY STORED FOR THIS POST
+        # ==============================
 
-        if not text:
-            raise HTTPException(
-                status_code=400,
-                detail="Empty post text"
-            )
+        if post and post[2] and not payload.regenerate:
+            stored = list(reversed(post[2]))
+
+            if len(stored) == 1:
+                stored.append(stored[0])
+
+            print("⚡ Serving stored replies for post:", payload.postId)
+
+            return {
+                "option1": stored[0],
+                "option2": stored[1],
+                "source": "stored"
+            }
+
+        # ==============================
+        # FALLBACK → USE FRONTEND TEXT
+        # ==============================
+
+        text = _resolve_text(post, payload)
+        url = post[1] if post else None
 
         print("🧠 Generating replies for post:", payload.postId)
 
         # ==============================
-        # GENERATE USING AI
+        # REPLY CACHE, THEN AI
         # ==============================
 
-        replies = generate_replies(
+        replies, source = get_or_generate_replies(
             text=text,
             platform="reddit",
             url=url,
-            company_details={}
+            regenerate=payload.regenerate
         )
 
         if not replies:
@@ -159,11 +236,16 @@ def generate_single_reply(payload: GenerateRequest):
         if len(replies) == 1:
             replies.append(replies[0])
 
+        # Known posts keep their replies, so the next click is a lookup
+        if post:
+            _store_replies(payload.postId, replies[:2])
+
         print("✅ Generated replies:", replies)
 
         return {
             "option1": replies[0],
-            "option2": replies[1]
+            "option2": replies[1],
+            "source": source
         }
 
     except HTTPException:
@@ -176,6 +258,91 @@ def generate_single_reply(payload: GenerateRequest):
             detail=str(e)
         )
 
-    finally:
-        cursor.close()
-        conn.close()
\ No newline at end of file
+
+
+# ==============================
+# STREAMING GENERATE (SSE)
+# ==============================
+
+def _sse_frame(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/generate/stream")
+async def stream_single_reply(payload: GenerateRequest):
+    """
+    Same as /reddit/generate, streamed as server-sent events:
+    `option` events ({"option": 1|2, "delta": "..."}) while tokens arrive,
+    then one `done` event with option1/option2/source (or an `error`).
+    Stored and cached replies are sent straight away as full options.
+    """
+    ready = None
+
+    # Errors before the stream starts get the same HTTP answers as
+    # /reddit/generate (404 for an unknown post without text, 500 otherwise)
+    try:
+        post = await asyncio.to_thread(_load_post, payload.postId)
+
+        if post and post[2] and not payload.regenerate:
+            ready, source = list(reversed(post[2])), "stored"
+        else:
+            text = _resolve_text(post, payload)
+
+            if not payload.regenerate:
+                cached = await asyncio.to_thread(reply_cache.get, text, "reddit", PROMPT_VERSION, MODEL_KEY)
+                if cached:
+                    ready, source = cached, "cache"
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        print("❌ Stream generate error:", str(e))
+        raise HTTPException(
+            status_code=500,
+            detail=str(e)
+        )
+
+    async def events():
+        if ready is not None:
+            replies = ready + ready[:1] if len(ready) == 1 else ready
+
+            if source == "cache" and post:
+                await asyncio.to_thread(_store_replies, payload.postId, replies[:2])
+
+            for number, reply in enumerate(replies[:2], start=1):
+                yield _sse_frame("option", {"option": number, "delta": reply})
+
+            yield _sse_frame("done", {"option1": replies[0], "option2": replies[1], "source": source})
+            return
+
+        print("🧠 Streaming replies for post:", payload.postId)
+
+        try:
+            async for event in stream_replies(text, platform="reddit"):
+                if event[0] == "delta":
+                    yield _sse_frame("option", {"option": event[1], "delta": event[2]})
+                    continue
+
+                replies = event[1]
+
+                if not replies:
+                    yield _sse_frame("error", {"detail": "Reply generation failed"})
+                    return
+
+                await asyncio.to_thread(reply_cache.put, text, "reddit", PROMPT_VERSION, MODEL_KEY, replies)
+
+                if post:
+                    await asyncio.to_thread(_store_replies, payload.postId, replies)
+
+                yield _sse_frame("done", {"option1": replies[0], "option2": replies[1], "source": "llm"})
+
+        except Exception as e:
+            print("❌ Stream generate error:", str(e))
+            yield _sse_frame("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
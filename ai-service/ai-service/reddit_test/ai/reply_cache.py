@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+from intent_engine.app.config import CACHE_DIR
+from intent_engine.app.utils.sqlite_utils import open_cache_db
+
+# ==============================
+# CONFIG
+# ==============================
+
+# Generated replies by (normalized text, platform, prompt version, model)
+REPLY_CACHE_PATH = os.getenv("REPLY_CACHE_PATH", os.path.join(CACHE_DIR, "replies.sqlite3"))
+REPLY_CACHE_TTL_SECONDS = int(os.getenv("REPLY_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Expired rows are purged once every this many writes
+PURGE_EVERY = 200
+
+_lock = threading.Lock()
+_conn = None
+_writes = 0
+
+_counters = {
+    "hits": 0,
+    "misses": 0,
+    "stores": 0,
+}
+
+
+def _connect():
+    global _conn
+
+    if _conn is None:
+        _conn = open_cache_db(REPLY_CACHE_PATH, """
+            CREATE TABLE IF NOT EXISTS replies (
+                key TEXT PRIMARY KEY,
+                replies TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+        """)
+
+    return _conn
+
+
+def cache_key(text, platform, prompt_version, model):
+    normalized = " ".join(text.lower().split())
+    raw = "\0".join((platform, prompt_version, model, normalized))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ==============================
+# LOOKUP / STORE
+# ==============================
+
+def get(text, platform, prompt_version, model):
+    key = cache_key(text, platform, prompt_version, model)
+
+    try:
+        with _lock:
+            row = _connect().execute(
+                "SELECT replies, created_at FROM replies WHERE key = ?",
+                (key,)
+            ).fetchone()
+    except Exception as e:
+        print("⚠️ Reply cache lookup failed:", e)
+        return None
+
+    with _lock:
+        if row is None or time.time() - row[1] >= REPLY_CACHE_TTL_SECONDS:
+            _counters["misses"] += 1
+            return None
+
+        _counters["hits"] += 1
+
+    return json.loads(row[0])
+
+
+def put(text, platform, prompt_version, model, replies):
+    global _writes
+
+    if not replies:
+        return
+
+    key = cache_key(text, platform, prompt_version, model)
+    now = time.time()
+
+    try:
+        with _lock:
+            conn = _connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO replies (key, replies, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(replies), now)
+            )
+
+            _writes += 1
+            _counters["stores"] += 1
+
+            if _writes % PURGE_EVERY == 0:
+                conn.execute("DELETE FROM replies WHERE created_at < ?", (now - REPLY_CACHE_TTL_SECONDS,))
+
+            conn.commit()
+    except Exception as e:
+        print("⚠️ Reply cache store failed:", e)
+
+
+def stats():
+    with _lock:
+        lookups = _counters["hits"] + _counters["misses"]
+
+        return {
+            **_counters,
+            "ttl_seconds": REPLY_CACHE_TTL_SECONDS,
+            "hit_ratio": round(_counters["hits"] / lookups, 3) if lookups else 0.0,
+        }
@@ -3,69 +3,64 @@ load_dotenv()
 
 import os
 import re
-import psycopg2
-from mistralai import Mistral
+import time
+import asyncio
 from typing import List, Dict, Optional
 
+from reddit_test.ai import reply_cache
+from reddit_test.ai import style_context
+import model_router
+from llm_executor import parse_batch_replies, LLM_TIMEOUT_SECONDS
+from token_budget import compact, fit_context, log_usage, POST_TOKEN_BUDGET, REPLY_MAX_TOKENS
+
 # ==============================
 # ENV
 # ==============================
 
-DATABASE_URL = os.getenv("DATABASE_URL")
 MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
 
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL missing in .env")
-
-if not MISTRAL_API_KEY:
-    raise ValueError("MISTRAL_API_KEY missing in .env")
-
 # ==============================
-# MISTRAL CLIENT
+# MISTRAL CLIENT (CREATED ON FIRST USE)
 # ==============================
 
-client = Mistral(api_key=MISTRAL_API_KEY)
-MODEL = "mistral-small-latest"
+client = None
 
+# The model is picked per post by model_router; replies are cached under
+# its routing rules
+MODEL_KEY = model_router.ROUTING_KEY
 
-# ==============================
-# DB CONNECTION
-# ==============================
+# Bump whenever build_prompt changes, so cached replies from the old
+# prompt are no longer served
+PROMPT_VERSION = "reddit-v1"
+
+
+def get_client():
+    global client
+
+    if client is None:
+        if not MISTRAL_API_KEY:
+            raise ValueError("MISTRAL_API_KEY missing in .env")
 
-def get_conn():
-    return psycopg2.connect(DATABASE_URL)
+        from mistralai import Mistral
+
+        client = Mistral(api_key=MISTRAL_API_KEY)
+
+    return client
 
 
 # ==============================
 # NO-VECTOR RAG CONTEXT
 # ==============================
 
-def retrieve_context(limit: int = 5) -> str:
+def retrieve_context(limit: int = 5, text: Optional[str] = None) -> str:
     """
-    Fetch recent generated replies from DB
-    (acts like lightweight RAG)
+    Recent generated replies as style reference (acts like lightweight
+    RAG). Served from the in-process buffer in style_context, so this
+    normally costs no database round-trip. Trimmed to CONTEXT_TOKEN_BUDGET.
     """
 
     try:
-        conn = get_conn()
-        cur = conn.cursor()
-
-        cur.execute("""
-            SELECT generated_reply
-            FROM reddit_ai_replies
-            ORDER BY id DESC
-            LIMIT %s
-        """, (limit,))
-
-        rows = cur.fetchall()
-
-        cur.close()
-        conn.close()
-
-        if not rows:
-            return ""
-
-        return "\n".join([r[0] for r in rows])
+        return "\n".join(fit_context(style_context.select(limit, text)))
 
     except Exception as e:
         print("⚠️ Context fetch failed:", e)
@@ -76,17 +71,21 @@ def retrieve_context(limit: int = 5) -> str:
 # LLM CALL
 # ==============================
 
-def ask_llm(prompt: str):
+def ask_llm(prompt: str, tier: str = "large", json_output: bool = False, posts: int = 1):
 
-    response = client.chat.complete(
-        model=MODEL,
-        messages=[
+    extra = {"response_format": {"type": "json_object"}} if json_output else {}
+
+    return model_router.complete(
+        get_client(),
+        tier,
+        "reddit.batch" if posts > 1 else "reddit.single",
+        [
             {"role": "user", "content": prompt}
-        ]
+        ],
+        max_tokens=REPLY_MAX_TOKENS * posts,
+        **extra
     )
 
-    return response.choices[0].message.content
-
 
 # ==============================
 # PROMPT BUILDER
@@ -101,7 +100,7 @@ Past successful replies (for style reference):
 {context}
 
 Current post:
-{text}
+{compact(text, POST_TOKEN_BUDGET)}
 
 Rules:
 - Human tone
@@ -119,6 +118,39 @@ Option 2: <reply>
 """
 
 
+def build_batch_prompt(posts, platform, context):
+
+    listing = "\n\n".join(
+        f"[{number}]\n{compact(post['text'], POST_TOKEN_BUDGET)}"
+        for number, post in enumerate(posts, start=1)
+    )
+
+    return f"""
+You are a real human replying naturally on {platform}.
+
+Past successful replies (for style reference):
+{context}
+
+Posts (each starts with its number in brackets):
+
+{listing}
+
+Rules:
+- Human tone
+- Helpful
+- NOT salesy
+- 1–3 lines max
+- Sound natural like Reddit user
+- Each reply only answers its own post
+
+Generate TWO reply options for EVERY post.
+
+Return ONLY JSON, exactly in this shape:
+
+{{"replies": [{{"id": "<post number>", "options": ["<reply 1>", "<reply 2>"]}}]}}
+"""
+
+
 # ==============================
 # MAIN FUNCTION
 # ==============================
@@ -127,25 +159,40 @@ def generate_replies(
     text: str,
     platform: str = "reddit",
     url: Optional[str] = None,
-    company_details: Optional[Dict] = None
+    company_details: Optional[Dict] = None,
+    tier: Optional[str] = None
 ) -> List[str]:
 
     if not text:
         return []
 
-    # ⭐ NO-VECTOR CONTEXT
-    context = retrieve_context()
+    # ⭐ SMALL MODEL UNLESS THE POST IS HIGH-INTENT
+    tier = tier or model_router.choose_tier(text)
+
+    # ⭐ NO-VECTOR CONTEXT (in-memory, optionally closest to this post)
+    context = retrieve_context(text=text)
 
     prompt = build_prompt(text, platform, context)
 
     try:
-        raw = ask_llm(prompt)
+        raw = ask_llm(prompt, tier)
         print("🧠 Mistral Output:", raw)
 
     except Exception as e:
         print("❌ Generation error:", e)
         return []
 
+    replies = parse_options(raw)
+
+    if not replies and model_router.should_escalate(tier):
+        model_router.record_escalation("unparseable reply")
+        return generate_replies(text, platform, url, company_details, tier="large")
+
+    return replies
+
+
+def parse_options(raw: str) -> List[str]:
+
     matches = re.findall(
         r"Option\s*\d+\s*:\s*(.*?)(?=Option\s*\d+\s*:|$)",
         raw,
@@ -159,6 +206,208 @@ def generate_replies(
 
     return replies[:2]
 
+
+# ==============================
+# STREAMING
+# ==============================
+
+OPTION_MARKER = re.compile(r"Option\s*(\d+)\s*:\s*", re.IGNORECASE)
+
+# Tail that might still grow into an "Option N:" marker
+PARTIAL_MARKER = re.compile(r"O(?:p(?:t(?:i(?:o(?:n\s*\d*\s*)?)?)?)?)?$", re.IGNORECASE)
+
+
+class OptionStream:
+    """
+    Splits a streamed "Option 1: ... Option 2: ..." completion into
+    per-option deltas as tokens arrive. Text that could still turn into
+    the next marker is held back until the following chunk decides it.
+    """
+
+    def __init__(self):
+        self.raw = ""
+        self.sent = {}
+
+    def _options(self, final):
+        raw = self.raw
+
+        if not final:
+            partial = PARTIAL_MARKER.search(raw)
+            if partial:
+                raw = raw[:partial.start()]
+
+        markers = list(OPTION_MARKER.finditer(raw))
+        options = {}
+
+        for position, marker in enumerate(markers):
+            end = markers[position + 1].start() if position + 1 < len(markers) else len(raw)
+            options[int(marker.group(1))] = raw[marker.end():end]
+
+        return options
+
+    def _deltas(self, final):
+        deltas = []
+
+        for number, text in self._options(final).items():
+            # Trailing whitespace may be the gap before the next marker
+            text = text.rstrip() if not final else text.strip()
+            sent = self.sent.get(number, 0)
+
+            if len(text) > sent:
+                deltas.append((number, text[sent:]))
+                self.sent[number] = len(text)
+
+        return deltas
+
+    def feed(self, chunk: str):
+        self.raw += chunk
+        return self._deltas(final=False)
+
+    def close(self):
+        return self._deltas(final=True)
+
+
+async def stream_replies(text: str, platform: str = "reddit"):
+    """
+    Stream a generation for `text`.
+
+    Yields ("delta", option number, text) as tokens arrive, then one
+    ("done", replies, raw completion) with the parsed options.
+    """
+    # Intent routing and similarity selection run the embedding model;
+    # keep them off the event loop
+    tier = await asyncio.to_thread(model_router.choose_tier, text)
+    context = await asyncio.to_thread(retrieve_context, 5, text)
+    prompt = build_prompt(text, platform, context)
+
+    model = model_router.model_for(tier)
+    parser = OptionStream()
+    usage = None
+    started = time.perf_counter()
+
+    response = await get_client().chat.stream_async(
+        model=model,
+        messages=[
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=REPLY_MAX_TOKENS,
+        timeout_ms=int(LLM_TIMEOUT_SECONDS * 1000)
+    )
+
+    async for event in response:
+        # Only the final chunk carries usage
+        usage = getattr(event.data, "usage", None) or usage
+        content = event.data.choices[0].delta.content
+
+        if not isinstance(content, str) or not content:
+            continue
+
+        for number, delta in parser.feed(content):
+            yield "delta", number, delta
+
+    for number, delta in parser.close():
+        yield "delta", number, delta
+
+    print("🧠 Mistral Output:", parser.raw)
+
+    latency_ms = (time.perf_counter() - started) * 1000
+    log_usage(f"reddit.stream.{tier}", model, prompt, usage, latency_ms)
+    model_router.record(tier, latency_ms, usage)
+
+    yield "done", parse_options(parser.raw), parser.raw
+
+
+def get_or_generate_replies(
+    text: str,
+    platform: str = "reddit",
+    url: Optional[str] = None,
+    regenerate: bool = False
+):
+    """
+    Replies for `text` from the reply cache, or freshly generated (and
+    cached) on a miss or when `regenerate` is set.
+    Returns (replies, "cache" | "llm").
+    """
+    if not regenerate:
+        cached = reply_cache.get(text, platform, PROMPT_VERSION, MODEL_KEY)
+        if cached:
+            return cached, "cache"
+
+    replies = generate_replies(text=text, platform=platform, url=url)
+
+    if len(replies) >= 2:
+        reply_cache.put(text, platform, PROMPT_VERSION, MODEL_KEY, replies)
+
+    return replies, "llm"
+
+
+def _generate_tier_batch(posts: List[Dict], platform: str, tier: str) -> Dict:
+
+    if len(posts) == 1:
+        post = posts[0]
+        return {post["id"]: generate_replies(post["text"], platform, post.get("url"), tier=tier)}
+
+    context = retrieve_context()
+    prompt = build_batch_prompt(posts, platform, context)
+
+    try:
+        parsed = parse_batch_replies(ask_llm(prompt, tier, json_output=True, posts=len(posts)))
+    except Exception as e:
+        print("❌ Batch generation error:", e)
+        parsed = {}
+
+    results = {}
+
+    for number, post in enumerate(posts, start=1):
+        replies = parsed.get(str(number), [])[:2]
+
+        if len(replies) == 1:
+            replies.append(replies[0])
+
+        if not replies:
+            print("↩️ Batch missed a post, generating it alone:", post["text"][:60])
+
+            retry_tier = tier
+            if model_router.should_escalate(tier):
+                model_router.record_escalation("post missing from batch answer")
+                retry_tier = "large"
+
+            replies = generate_replies(post["text"], platform, post.get("url"), tier=retry_tier)
+
+        results[post["id"]] = replies
+
+    return results
+
+
+def generate_replies_batch(
+    posts: List[Dict],
+    platform: str = "reddit"
+) -> Dict:
+    """
+    Replies for several posts from one request per model tier.
+
+    `posts` are dicts with `id`, `text` and optionally `url`; the result
+    maps each id to its two replies. High-intent posts are batched for the
+    large model, the rest for the small one. Posts a batched answer left
+    out (or that came back unparseable) get their own generate_replies
+    call, on the large model when escalation is on.
+    """
+    posts = [post for post in posts if post.get("text")]
+
+    if not posts:
+        return {}
+
+    by_tier = {}
+    for post, tier in zip(posts, model_router.choose_tiers(post["text"] for post in posts)):
+        by_tier.setdefault(tier, []).append(post)
+
+    results = {}
+
+    for tier, tier_posts in by_tier.items():
+        results.update(_generate_tier_batch(tier_posts, platform, tier))
+
+    return results
+
 # from dotenv import load_dotenv
 # load_dotenv()
 
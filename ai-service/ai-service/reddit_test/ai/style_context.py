@@ -0,0 +1,135 @@
+import os
+import time
+import threading
+from collections import deque
+from typing import List, Optional
+
+import numpy as np
+
+from pg_pool import get_connection
+
+# ==============================
+# CONFIG
+# ==============================
+
+# Recent replies kept in memory as style references
+STYLE_CONTEXT_BUFFER_SIZE = int(os.getenv("STYLE_CONTEXT_BUFFER_SIZE", "50"))
+
+# Replies written by other replicas show up after at most this long
+STYLE_CONTEXT_TTL_SECONDS = int(os.getenv("STYLE_CONTEXT_TTL_SECONDS", "60"))
+
+# Pick the buffered replies closest to the post (embedding cosine) instead
+# of the most recent ones
+STYLE_CONTEXT_SIMILARITY = os.getenv("STYLE_CONTEXT_SIMILARITY", "0") == "1"
+
+# ==============================
+# RING BUFFER
+# ==============================
+
+# Oldest reply on the left, newest on the right
+_buffer = deque(maxlen=STYLE_CONTEXT_BUFFER_SIZE)
+_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_loaded_at = 0.0
+
+
+def _load_rows():
+    conn = get_connection()
+
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT generated_reply
+            FROM reddit_ai_replies
+            ORDER BY id DESC
+            LIMIT %s
+        """, (STYLE_CONTEXT_BUFFER_SIZE,))
+
+        return [row[0] for row in cur.fetchall() if row[0]]
+
+    finally:
+        conn.close()
+
+
+def refresh():
+    """Reload the buffer from reddit_ai_replies."""
+    global _loaded_at
+
+    with _refresh_lock:
+        try:
+            rows = _load_rows()
+        except Exception as e:
+            print("⚠️ Context fetch failed:", e)
+            rows = None
+
+        with _lock:
+            # Retry a failed load after a full TTL, not on every call
+            _loaded_at = time.time()
+
+            if rows is not None:
+                _buffer.clear()
+                _buffer.extend(reversed(rows))
+
+
+def _refresh_in_background():
+    if _refresh_lock.locked():
+        return
+
+    threading.Thread(target=refresh, name="style-context-refresh", daemon=True).start()
+
+
+def add(replies: List[str]):
+    """Record replies this process just stored, without a round-trip."""
+    with _lock:
+        _buffer.extend(reply for reply in replies if reply)
+
+
+def _snapshot():
+    if _loaded_at == 0.0:
+        # First use in this process: one blocking load (warm-up normally
+        # does this before any request)
+        refresh()
+    elif time.time() - _loaded_at >= STYLE_CONTEXT_TTL_SECONDS:
+        _refresh_in_background()
+
+    with _lock:
+        return list(_buffer)
+
+
+def _most_similar(replies: List[str], text: str, limit: int):
+    # Local model and embedding cache only; no network call
+    from intent_engine.app.services.intent_service import embed_texts
+
+    vectors = embed_texts(replies + [text])
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+    scores = vectors[:-1] @ vectors[-1]
+    best = np.argsort(-scores)[:limit]
+
+    return [replies[i] for i in best]
+
+
+def select(limit: int = 5, text: Optional[str] = None) -> List[str]:
+    """
+    Style reference replies: the `limit` most recent ones, or with
+    STYLE_CONTEXT_SIMILARITY and a `text`, the ones closest to it.
+    """
+    replies = list(dict.fromkeys(_snapshot()))
+
+    if STYLE_CONTEXT_SIMILARITY and text and len(replies) > limit:
+        try:
+            return _most_similar(replies, text, limit)
+        except Exception as e:
+            print("⚠️ Similarity context failed, using recent replies:", e)
+
+    return replies[-limit:][::-1]
+
+
+def stats():
+    with _lock:
+        return {
+            "size": len(_buffer),
+            "capacity": STYLE_CONTEXT_BUFFER_SIZE,
+            "age_seconds": round(time.time() - _loaded_at, 1) if _loaded_at else None,
+            "similarity": STYLE_CONTEXT_SIMILARITY,
+        }
@@ -1,5 +1,4 @@
 import os
-import psycopg2
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -17,7 +16,5 @@ if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL is not set. Check ai-service/.env")
 
 
-def get_cursor():
-    conn = psycopg2.connect(DATABASE_URL)
-    conn.autocommit = True
-    return conn.cursor(), conn
+# Connections come from the process-wide pool; conn.close() returns them
+from pg_pool import get_connection, get_cursor  # noqa: E402,F401
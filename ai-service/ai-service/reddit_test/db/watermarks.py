@@ -0,0 +1,107 @@
+from typing import Dict, List
+
+from pg_pool import cursor as pooled_cursor
+
+# ==============================
+# WATERMARK TABLE
+# ==============================
+
+# Newest Reddit post already scraped per (user, keyword), so the next run
+# only asks Reddit for posts newer than it. checked_at is the last time the
+# keyword was fetched without an anchor (first run or periodic recheck).
+
+CREATE_WATERMARKS_TABLE = """
+    CREATE TABLE IF NOT EXISTS reddit_keyword_watermarks (
+        user_id TEXT NOT NULL,
+        keyword TEXT NOT NULL,
+        newest_fullname TEXT NOT NULL,
+        newest_created_utc DOUBLE PRECISION NOT NULL,
+        checked_at TIMESTAMPTZ,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        PRIMARY KEY (user_id, keyword)
+    )
+"""
+
+_table_ready = False
+
+
+def normalize_keyword(keyword: str) -> str:
+    return " ".join(keyword.lower().split())
+
+
+def _ensure_table():
+    global _table_ready
+
+    if not _table_ready:
+        # On its own autocommit connection: the caller's cursor may be in a
+        # transaction that is later rolled back, taking the table with it
+        with pooled_cursor() as cursor:
+            cursor.execute(CREATE_WATERMARKS_TABLE)
+
+        _table_ready = True
+
+
+def load_watermarks(cursor, user_id: str, keywords: List[str]) -> Dict[str, dict]:
+    """Watermarks for `keywords` keyed by the keyword as given; missing ones are left out."""
+    _ensure_table()
+
+    # Keywords differing only by case/spacing share one watermark
+    by_normalized = {}
+    for keyword in keywords:
+        by_normalized.setdefault(normalize_keyword(keyword), []).append(keyword)
+
+    cursor.execute(
+        """
+        SELECT keyword, newest_fullname, newest_created_utc,
+               EXTRACT(EPOCH FROM checked_at)
+        FROM reddit_keyword_watermarks
+        WHERE user_id = %s AND keyword = ANY(%s)
+        """,
+        (user_id, list(by_normalized))
+    )
+
+    return {
+        raw: {
+            "fullname": fullname,
+            "created_utc": created_utc,
+            "checked_at": float(checked_at) if checked_at is not None else 0.0,
+        }
+        for keyword, fullname, created_utc, checked_at in cursor.fetchall()
+        for raw in by_normalized[keyword]
+    }
+
+
+def save_watermarks(cursor, user_id: str, watermarks: Dict[str, dict]):
+    """
+    Move each keyword's watermark forward (never back). Marks with
+    `checked` set also record that the keyword was just fetched unanchored.
+    """
+    if not watermarks:
+        return
+
+    _ensure_table()
+
+    for keyword, mark in watermarks.items():
+        cursor.execute(
+            """
+            INSERT INTO reddit_keyword_watermarks AS w
+            (user_id, keyword, newest_fullname, newest_created_utc, checked_at)
+            VALUES (%s, %s, %s, %s, CASE WHEN %s THEN now() END)
+            ON CONFLICT (user_id, keyword) DO UPDATE
+            SET newest_fullname = CASE
+                    WHEN EXCLUDED.newest_created_utc > w.newest_created_utc
+                    THEN EXCLUDED.newest_fullname
+                    ELSE w.newest_fullname
+                END,
+                newest_created_utc = GREATEST(w.newest_created_utc, EXCLUDED.newest_created_utc),
+                checked_at = COALESCE(EXCLUDED.checked_at, w.checked_at),
+                updated_at = now()
+            """,
+            (
+                user_id,
+                normalize_keyword(keyword),
+                mark["fullname"],
+                mark["created_utc"],
+                bool(mark.get("checked"))
+            )
+        )
@@ -0,0 +1,261 @@
+import os
+import time
+import random
+import asyncio
+import threading
+from typing import Dict, List, Optional
+
+import httpx
+
+SEARCH_URL = "https://www.reddit.com/search.json"
+
+HEADERS = {
+    "User-Agent": "LeadEquatorApp/1.0 by NageshY"
+}
+
+# ==============================
+# CONFIG
+# ==============================
+
+# Keyword searches in flight at once
+REDDIT_FETCH_CONCURRENCY = int(os.getenv("REDDIT_FETCH_CONCURRENCY", "4"))
+
+# Until Reddit reports its own limits: steady rate and burst size
+REDDIT_REQUESTS_PER_SECOND = float(os.getenv("REDDIT_REQUESTS_PER_SECOND", "1"))
+REDDIT_BURST = float(os.getenv("REDDIT_BURST", "4"))
+
+REDDIT_TIMEOUT_SECONDS = float(os.getenv("REDDIT_TIMEOUT_SECONDS", "10"))
+REDDIT_MAX_RETRIES = int(os.getenv("REDDIT_MAX_RETRIES", "3"))
+
+# Watermarked keywords are paged with `before`, this many posts a page and
+# at most this many pages per run
+REDDIT_PAGE_LIMIT = int(os.getenv("REDDIT_PAGE_LIMIT", "100"))
+REDDIT_MAX_PAGES = int(os.getenv("REDDIT_MAX_PAGES", "3"))
+
+# A `before` anchor that was deleted silently returns nothing forever; an
+# unanchored fetch this often catches that
+REDDIT_WATERMARK_RECHECK_SECONDS = int(os.getenv("REDDIT_WATERMARK_RECHECK_SECONDS", str(6 * 3600)))
+
+# Backoff after a 429 with no usable Retry-After / reset header
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 60.0
+
+
+# ==============================
+# TOKEN BUCKET
+# ==============================
+
+class TokenBucket:
+    """
+    Request budget shared by every fetch in the process.
+
+    `reserve()` never sleeps: it books the next token and returns how long
+    the caller has to wait for it, so async callers can `asyncio.sleep`
+    without holding a worker thread. Reddit's X-Ratelimit headers reshape
+    the bucket to whatever is left of the current window.
+    """
+
+    def __init__(self, rate, burst):
+        self._lock = threading.Lock()
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            self.tokens -= 1
+            delay = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+            return max(delay, self.paused_until - now)
+
+    def update(self, remaining, reset_seconds):
+        """Fit the bucket to `remaining` requests over the next `reset_seconds`."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if remaining < 1:
+                self.tokens = min(self.tokens, 0)
+                self.paused_until = max(self.paused_until, now + reset_seconds)
+                return
+
+            # Spread what is left evenly over the rest of the window
+            self.rate = max(remaining / max(reset_seconds, 1.0), 0.01)
+            self.burst = min(REDDIT_BURST, remaining)
+            self.tokens = min(self.tokens, remaining)
+
+    def pause(self, seconds):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+limiter = TokenBucket(REDDIT_REQUESTS_PER_SECOND, REDDIT_BURST)
+
+
+def _header_float(headers, name):
+    try:
+        return float(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+def _observe_limits(headers):
+    remaining = _header_float(headers, "X-Ratelimit-Remaining")
+    reset = _header_float(headers, "X-Ratelimit-Reset")
+
+    if remaining is not None and reset is not None:
+        limiter.update(remaining, reset)
+
+
+def _retry_after(response, attempt):
+    for name in ("Retry-After", "X-Ratelimit-Reset"):
+        seconds = _header_float(response.headers, name)
+        if seconds is not None:
+            return min(seconds, BACKOFF_MAX_SECONDS)
+
+    backoff = min(BACKOFF_BASE_SECONDS * 2 ** attempt, BACKOFF_MAX_SECONDS)
+    return backoff * random.uniform(0.5, 1.0)
+
+
+# ==============================
+# FETCHING
+# ==============================
+
+async def fetch_keyword(
+    client: httpx.AsyncClient,
+    keyword: str,
+    limit: int = 25,
+    before: Optional[str] = None
+) -> Optional[List[dict]]:
+    """
+    Newest posts for `keyword` (only those newer than the `before`
+    fullname, if given). None on errors so one keyword never sinks a run.
+    """
+    params = {
+        "q": keyword,
+        "sort": "new",
+        "limit": limit
+    }
+
+    if before:
+        params["before"] = before
+
+    for attempt in range(REDDIT_MAX_RETRIES + 1):
+        delay = limiter.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        try:
+            response = await client.get(SEARCH_URL, params=params)
+        except httpx.HTTPError as e:
+            print(f"❌ Reddit request error for '{keyword}':", e)
+            return None
+
+        _observe_limits(response.headers)
+
+        if response.status_code == 429:
+            wait = _retry_after(response, attempt)
+            limiter.pause(wait)
+            print(f"⏳ Reddit rate limited on '{keyword}', retrying in {wait:.1f}s")
+            continue
+
+        if response.status_code != 200:
+            print("❌ Reddit API error:", response.status_code)
+            return None
+
+        try:
+            return [item["data"] for item in response.json()["data"]["children"]]
+        except (ValueError, KeyError, TypeError) as e:
+            # 200 with an HTML block page or an unexpected shape
+            print(f"❌ Reddit returned an unreadable listing for '{keyword}':", e)
+            return None
+
+    print(f"❌ Reddit still rate limited for '{keyword}', giving up")
+    return None
+
+
+async def fetch_new_posts(client: httpx.AsyncClient, keyword: str, watermark: Optional[dict], limit: int = 25):
+    """
+    Posts for `keyword` newer than its watermark, newest first.
+
+    Without a watermark this is the plain newest-`limit` search. With one,
+    pages are requested with `before=<newest fullname seen>`, and another
+    page is only requested while the previous one came back full. Returns
+    a dict with the posts, whether the fetch was unanchored (`checked`)
+    and whether it failed.
+    """
+    if watermark is None:
+        posts = await fetch_keyword(client, keyword, limit)
+        return {"posts": posts or [], "checked": posts is not None, "failed": posts is None}
+
+    # Each `before` page holds the posts just newer than the anchor, so the
+    # next page is anchored on this page's newest post
+    pages = []
+    anchor = watermark["fullname"]
+
+    for _ in range(REDDIT_MAX_PAGES):
+        page = await fetch_keyword(client, keyword, REDDIT_PAGE_LIMIT, before=anchor)
+
+        if page is None:
+            return {"posts": [], "checked": False, "failed": True}
+
+        if not page:
+            break
+
+        pages.append(page)
+
+        if len(page) < REDDIT_PAGE_LIMIT:
+            break
+
+        anchor = page[0]["name"]
+
+    posts = [post for page in reversed(pages) for post in page]
+    checked = False
+
+    if not posts and time.time() - watermark["checked_at"] >= REDDIT_WATERMARK_RECHECK_SECONDS:
+        posts = await fetch_keyword(client, keyword, limit)
+
+        if posts is None:
+            return {"posts": [], "checked": False, "failed": True}
+
+        checked = True
+
+    # `before` pages are already newer than the anchor; this mainly trims
+    # the unanchored recheck. Posts from the watermark's own second are
+    # kept (already-stored ones are dropped by url when storing)
+    posts = [
+        post for post in posts
+        if post.get("created_utc", 0) >= watermark["created_utc"]
+        and post.get("name") != watermark["fullname"]
+    ]
+
+    return {"posts": posts, "checked": checked, "failed": False}
+
+
+async def search_keywords(keywords: List[str], watermarks: Optional[Dict[str, dict]] = None, limit: int = 25) -> Dict[str, dict]:
+    """
+    Search every keyword concurrently, only for posts newer than its
+    watermark when it has one; results keep the keywords' order.
+    """
+    keywords = list(dict.fromkeys(keywords))
+    watermarks = watermarks or {}
+    semaphore = asyncio.Semaphore(REDDIT_FETCH_CONCURRENCY)
+
+    async with httpx.AsyncClient(headers=HEADERS, timeout=REDDIT_TIMEOUT_SECONDS) as client:
+
+        async def one(keyword):
+            async with semaphore:
+                return await fetch_new_posts(client, keyword, watermarks.get(keyword), limit)
+
+        results = await asyncio.gather(*(one(keyword) for keyword in keywords))
+
+    return dict(zip(keywords, results))
@@ -1,9 +1,12 @@
 from typing import Optional
+from psycopg2.extras import execute_values
 from reddit_test.db.neon import get_cursor
-from reddit_test.ai.reply_generator import generate_replies
+from reddit_test.ai.reply_generator import generate_replies_batch
+from reddit_test.ai import style_context
+from llm_executor import run_bounded, chunked
 
 
-def generate_reddit_replies(user_id: Optional[str] = None):
+def _load_posts(user_id: Optional[str]):
 
     cursor, conn = get_cursor()
 
@@ -29,47 +32,84 @@ def generate_reddit_replies(user_id: Optional[str] = None):
                 LIMIT 20
             """)
 
-        posts = cursor.fetchall()
+        return cursor.fetchall()
+
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def generate_reddit_replies(user_id: Optional[str] = None):
+
+    try:
+
+        # The connection goes back to the pool before the (slow) LLM run;
+        # each post's insert takes its own short-lived one
+        posts = _load_posts(user_id)
 
         if not posts:
             print("⚠️ No posts found.")
             return
 
-        for post_id, text, url in posts:
-
-            text = (text or "").strip()
-            if not text:
-                continue
+        posts = [
+            (post_id, (text or "").strip(), url)
+            for post_id, text, url in posts
+            if (text or "").strip()
+        ]
+
+        # Posts go to the model in batches (one request each); batches run
+        # concurrently and each post's replies are written (autocommit) as
+        # soon as its batch comes back
+        def generate(batch):
+            for _, text, _ in batch:
+                print("🧠 Generating replies:", text[:80])
+
+            return generate_replies_batch(
+                [{"id": post_id, "text": text, "url": url} for post_id, text, url in batch],
+                platform="reddit"
+            )
 
-            print("🧠 Generating replies:", text[:80])
+        stored = 0
 
-            replies = generate_replies(
-                text=text,
-                platform="reddit",
-                url=url
-            )
+        def store_post(post_id, replies):
+            nonlocal stored
 
             if not replies:
-                continue
+                return
+
+            try:
+                cursor, conn = get_cursor()
+            except Exception as e:
+                print("❌ Reply insert error:", e)
+                return
 
-            for reply in replies:
-                cursor.execute("""
+            try:
+                # One statement, so a post never ends up with half its replies
+                execute_values(cursor, """
                     INSERT INTO reddit_ai_replies
                     (reddit_post_id, intent, generated_reply)
-                    VALUES (%s, %s, %s)
-                """, (
-                    post_id,
-                    "no_vector_rag",
-                    reply
-                ))
+                    VALUES %s
+                """, [
+                    (post_id, "no_vector_rag", reply)
+                    for reply in replies
+                ])
+            except Exception as e:
+                print("❌ Reply insert error:", e)
+                return
+
+            finally:
+                conn.close()
+
+            style_context.add(replies)
+            stored += 1
 
-        conn.commit()
-        print("🎉 Replies stored successfully")
+        def store(batch, results):
+            for post_id, _, _ in batch:
+                store_post(post_id, (results or {}).get(post_id))
+
+        run_bounded(chunked(posts), generate, store)
+
+        print(f"🎉 Replies stored successfully for {stored} of {len(posts)} posts")
 
     except Exception as e:
-        conn.rollback()
         print("❌ Error:", e)
-
-    finally:
-        cursor.close()
-        conn.close()
\ No newline at end of file
@@ -1,97 +1,131 @@
-import requests
-from typing import List, Optional
+import asyncio
+from typing import Dict, List, Optional
+from psycopg2.extras import execute_values
 from reddit_test.db.neon import get_cursor
-import time
+from reddit_test.db.watermarks import load_watermarks, save_watermarks
+from reddit_test.reddit_fetcher import search_keywords
 
 MAX_POSTS_PER_RUN = 5
 
-HEADERS = {
-    "User-Agent": "LeadEquatorApp/1.0 by NageshY"
-}
 
-
-def scrape_reddit(user_id: str, keywords: Optional[List[str]] = None):
+def _load_watermarks(user_id: str, keywords: List[str]):
     cursor, conn = get_cursor()
-    inserted = 0
 
     try:
-        if not keywords:
-            print("⚠️ No keywords provided.")
-            return 0
-
-        collected_urls = set()
-
-        for keyword in keywords:
-            if inserted >= MAX_POSTS_PER_RUN:
-                break
+        return load_watermarks(cursor, user_id, keywords)
+    except Exception as e:
+        # Without watermarks every keyword is simply fetched in full
+        print("⚠️ Watermark lookup failed:", e)
+        return {}
+    finally:
+        conn.close()
 
-            params = {
-                "q": keyword,
-                "sort": "new",
-                "limit": 25
-            }
 
-            try:
-                response = requests.get(
-                    "https://www.reddit.com/search.json",
-                    headers=HEADERS,
-                    params=params,
-                    timeout=10
-                )
+def _post_url(post: dict):
+    if not post.get("title") or not post.get("permalink"):
+        return None
+    return "https://www.reddit.com" + post["permalink"]
 
-                if response.status_code != 200:
-                    print("❌ Reddit API error:", response.status_code)
-                    continue
 
-                data = response.json()
+def _existing_urls(cursor, urls: List[str]):
+    if not urls:
+        return set()
 
-                for item in data["data"]["children"]:
-                    if inserted >= MAX_POSTS_PER_RUN:
-                        break
+    cursor.execute("SELECT url FROM reddit_posts WHERE url = ANY(%s)", (urls,))
+    return {row[0] for row in cursor.fetchall()}
 
-                    post = item["data"]
 
-                    title = post.get("title")
-                    permalink = post.get("permalink")
-                    author = post.get("author")
+def _next_watermark(result: dict, consumed: Optional[dict], current: Optional[dict]):
+    if consumed is not None:
+        return {
+            "fullname": consumed["name"],
+            "created_utc": consumed["created_utc"],
+            "checked": result["checked"],
+        }
 
-                    if not title or not permalink:
-                        continue
+    if current is not None and result["checked"] and not result["posts"]:
+        return {**current, "checked": True}
 
-                    full_url = "https://www.reddit.com" + permalink
+    return None
 
-                    if full_url in collected_urls:
-                        continue
 
-                    collected_urls.add(full_url)
+def _store_posts(user_id: str, results: Dict[str, dict], watermarks: Dict[str, dict]):
+    """
+    Insert up to MAX_POSTS_PER_RUN posts that are really new, in one
+    multi-row INSERT, and return how many rows it created.
 
-                    cursor.execute(
-                        """
-                        INSERT INTO reddit_posts
-                        (user_id, platform, text, url, author)
-                        VALUES (%s, %s, %s, %s, %s)
-                        ON CONFLICT (url) DO NOTHING
-                        """,
-                        (
-                            user_id,
-                            "reddit",
-                            title.strip(),
-                            full_url,
-                            author
-                        )
-                    )
+    Each keyword's new posts are taken oldest first, and its watermark
+    only moves up to the last post taken: posts left over when the cap is
+    hit are newer than the watermark and get picked up on the next run.
+    """
+    cursor, conn = get_cursor()
+    conn.autocommit = False
 
-                    inserted += 1
-                    print("✅ INSERTED:", title[:80])
+    try:
+        urls = [
+            url
+            for result in results.values()
+            for url in map(_post_url, result["posts"])
+            if url
+        ]
+        existing = _existing_urls(cursor, list(dict.fromkeys(urls)))
+
+        rows = []
+        titles = {}
+        advanced = {}
+
+        for keyword, result in results.items():
+            consumed = None
+
+            for post in sorted(result["posts"], key=lambda post: post.get("created_utc", 0)):
+                if len(rows) >= MAX_POSTS_PER_RUN:
+                    break
+
+                url = _post_url(post)
+
+                if url and url not in existing and url not in titles:
+                    title = post["title"].strip()
+                    titles[url] = title
+                    rows.append((user_id, "reddit", title, url, post.get("author")))
+
+                if post.get("name") and post.get("created_utc"):
+                    consumed = post
+
+            if not result["failed"]:
+                mark = _next_watermark(result, consumed, watermarks.get(keyword))
+                if mark is not None:
+                    advanced[keyword] = mark
+
+        created = []
+        if rows:
+            # ON CONFLICT still guards against a concurrent run inserting
+            # the same url between the lookup and here
+            created = execute_values(
+                cursor,
+                """
+                INSERT INTO reddit_posts
+                (user_id, platform, text, url, author)
+                VALUES %s
+                ON CONFLICT (url) DO NOTHING
+                RETURNING id, url
+                """,
+                rows,
+                page_size=len(rows),
+                fetch=True
+            )
+
+        save_watermarks(cursor, user_id, advanced)
 
-                time.sleep(1)
+        conn.commit()
 
-            except Exception as e:
-                print("❌ Reddit request error:", e)
+        for _, url in created:
+            print("✅ INSERTED:", titles[url][:80])
 
-        conn.commit()
-        print(f"🎉 Reddit scraping finished — inserted {inserted} posts")
-        return inserted
+        print(
+            f"🎉 Reddit scraping finished — inserted {len(created)} new posts "
+            f"({len(existing)} already stored)"
+        )
+        return len(created)
 
     except Exception as e:
         print("❌ Scraper DB error:", str(e))
@@ -103,3 +137,28 @@ def scrape_reddit(user_id: str, keywords: Optional[List[str]] = None):
             conn.close()
         except Exception:
             pass
+
+
+async def scrape_reddit_async(user_id: str, keywords: Optional[List[str]] = None):
+    """
+    Fetch every keyword concurrently (rate limited, see reddit_fetcher),
+    asking only for posts newer than each keyword's watermark, then store
+    the posts off the event loop.
+    """
+    if not keywords:
+        print("⚠️ No keywords provided.")
+        return 0
+
+    watermarks = await asyncio.to_thread(_load_watermarks, user_id, keywords)
+
+    results = await search_keywords(keywords, watermarks)
+
+    fetched = sum(len(result["posts"]) for result in results.values())
+    print(f"📡 Reddit returned {fetched} new posts for {len(results)} keywords ({len(watermarks)} watermarked)")
+
+    return await asyncio.to_thread(_store_posts, user_id, results, watermarks)
+
+
+def scrape_reddit(user_id: str, keywords: Optional[List[str]] = None):
+    # For callers outside an event loop (background jobs, scripts)
+    return asyncio.run(scrape_reddit_async(user_id, keywords))
@@ -0,0 +1,148 @@
+import os
+import re
+
+# ==============================
+# CONFIG
+# ==============================
+
+# Post text is compacted to this many tokens before it goes into a prompt
+POST_TOKEN_BUDGET = int(os.getenv("POST_TOKEN_BUDGET", "600"))
+
+# Style-reference context: total budget and cap per past reply
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "300"))
+CONTEXT_REPLY_TOKENS = int(os.getenv("CONTEXT_REPLY_TOKENS", "80"))
+
+# Completion cap for one post's two replies (batched calls get one per post)
+REPLY_MAX_TOKENS = int(os.getenv("REPLY_MAX_TOKENS", "300"))
+
+# Share of a compacted text kept from its start; the rest comes from its end
+HEAD_SHARE = 0.7
+
+ELLIPSIS = " … "
+
+# Without Mistral's own tokenizer, ~4 characters per token is close enough
+# for English posts
+CHARS_PER_TOKEN = 4
+
+try:
+    from mistral_common.tokens.tokenizers.mistral import MistralTokenizer
+    _tokenizer = MistralTokenizer.v3().instruct_tokenizer.tokenizer
+except Exception:  # optional; fall back to the estimate below
+    _tokenizer = None
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+# ==============================
+# COUNTING
+# ==============================
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+
+    if _tokenizer is not None:
+        return len(_tokenizer.encode(text, bos=False, eos=False))
+
+    return max(1, -(-len(text) // CHARS_PER_TOKEN))
+
+
+def _cut(text: str, max_tokens: int, from_end: bool = False) -> str:
+    """Longest whole-word prefix (or suffix) of `text` within `max_tokens`."""
+    words = text.split()
+    if from_end:
+        words.reverse()
+
+    kept = []
+    used = 0
+
+    for word in words:
+        cost = count_tokens(word + " ")
+        if used + cost > max_tokens:
+            break
+        kept.append(word)
+        used += cost
+
+    if from_end:
+        kept.reverse()
+
+    return " ".join(kept)
+
+
+# ==============================
+# COMPACTION
+# ==============================
+
+def compact(text: str, max_tokens: int) -> str:
+    """
+    `text` cut down to `max_tokens`, keeping its opening (where the ask
+    usually is) and its last sentences (where the details usually are),
+    joined by an ellipsis. Text already within budget is returned as is.
+    """
+    text = " ".join((text or "").split())
+
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    budget = max(max_tokens - count_tokens(ELLIPSIS), 1)
+    head = _cut(text, int(budget * HEAD_SHARE))
+
+    # Prefer ending the head on a sentence boundary when one is close
+    sentences = SENTENCE_END.split(head)
+    if len(sentences) > 1 and len(sentences[-1]) < len(head) * 0.3:
+        head = " ".join(sentences[:-1])
+
+    tail = _cut(text[len(head):], budget - count_tokens(head), from_end=True)
+
+    return head + ELLIPSIS + tail if tail else head + ELLIPSIS.rstrip()
+
+
+def fit_context(replies, budget: int = None, per_reply: int = None):
+    """
+    Style-reference replies that fit the context budget, in the given
+    (priority) order, each compacted to at most `per_reply` tokens.
+    """
+    budget = CONTEXT_TOKEN_BUDGET if budget is None else budget
+    per_reply = CONTEXT_REPLY_TOKENS if per_reply is None else per_reply
+
+    kept = []
+    used = 0
+
+    for reply in replies:
+        reply = compact(reply, per_reply)
+        cost = count_tokens(reply)
+
+        if used + cost > budget:
+            break
+
+        kept.append(reply)
+        used += cost
+
+    return kept
+
+
+# ==============================
+# USAGE LOGGING
+# ==============================
+
+def log_usage(label: str, model: str, prompt: str, usage=None, latency_ms: float = None):
+    """
+    Log prompt/completion tokens for one call. `usage` is the API's
+    usage block when the response carried one; otherwise only the local
+    prompt estimate is logged.
+    """
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+
+    print(
+        f"📊 LLM {label} | {model} | "
+        f"prompt {prompt_tokens if prompt_tokens is not None else '?'} tokens "
+        f"(est. {count_tokens(prompt)}) | "
+        f"completion {completion_tokens if completion_tokens is not None else '?'} tokens"
+        + (f" | {latency_ms:.0f}ms" if latency_ms is not None else "")
+    )
+
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+    }
@@ -0,0 +1,170 @@
+import os
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Imported first by main.py, so this is as close to process start as we get
+PROCESS_STARTED = time.perf_counter()
+
+# Set WARMUP_ON_STARTUP=0 to load everything on first request instead
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1") != "0"
+
+WARMUP_SAMPLE_TEXT = "Looking for a CRM that helps a small sales team follow up on leads"
+
+# Components that must be loaded before /ready reports ready
+REQUIRED_COMPONENTS = ("intent_model",)
+
+# =========================
+# STARTUP REPORT
+# =========================
+
+_lock = threading.Lock()
+_thread = None
+
+_report = {
+    "import_seconds": None,
+    "warmup_seconds": None,
+    "warmup_started": False,
+    "warmup_finished": False,
+    "components": {},
+}
+
+
+def mark_imported():
+    """Record how long it took to import the app, before any model is loaded."""
+    with _lock:
+        _report["import_seconds"] = round(time.perf_counter() - PROCESS_STARTED, 3)
+
+
+def _set_component(name, **fields):
+    with _lock:
+        _report["components"].setdefault(name, {
+            "loaded": False,
+            "seconds": None,
+            "error": None,
+        }).update(fields)
+
+
+def _load_intent_model():
+    from intent_engine.app.services import intent_service
+
+    # Encoding once also pays for the first-call graph/kernel setup
+    intent_service.get_model().encode([WARMUP_SAMPLE_TEXT])
+
+
+def _load_intent_index():
+    from intent_engine.app.services import intent_index_service
+
+    intent_index_service.get_index()
+
+
+def _load_style_context():
+    from reddit_test.ai import style_context
+
+    style_context.refresh()
+
+
+def _load_keyword_model():
+    from extractor import get_model
+
+    get_model()
+
+
+COMPONENTS = (
+    ("intent_model", _load_intent_model),
+    ("intent_index", _load_intent_index),
+    ("style_context", _load_style_context),
+    ("keyword_model", _load_keyword_model),
+)
+
+
+def _warm_up():
+    started = time.perf_counter()
+
+    for name, load in COMPONENTS:
+        component_started = time.perf_counter()
+
+        try:
+            load()
+        except Exception as exc:
+            logger.exception("Warm-up of %s failed: %s", name, exc)
+            _set_component(name, error=str(exc))
+            continue
+
+        _set_component(
+            name,
+            loaded=True,
+            seconds=round(time.perf_counter() - component_started, 3),
+        )
+
+    with _lock:
+        _report["warmup_seconds"] = round(time.perf_counter() - started, 3)
+        _report["warmup_finished"] = True
+
+    report = startup_report()
+    logger.info(
+        "Startup report | import %ss | warm-up %ss | %s",
+        report["import_seconds"],
+        report["warmup_seconds"],
+        ", ".join(
+            f"{name} {component['seconds']}s" if component["loaded"] else f"{name} failed"
+            for name, component in report["components"].items()
+        ),
+    )
+
+
+def start_warmup():
+    """
+    Load the models in a background thread so the server accepts
+    connections (and answers /health) while they come up.
+    """
+    global _thread
+
+    with _lock:
+        if _thread is not None or not WARMUP_ON_STARTUP:
+            return
+
+        _report["warmup_started"] = True
+        for name, _ in COMPONENTS:
+            _report["components"][name] = {"loaded": False, "seconds": None, "error": None}
+
+        _thread = threading.Thread(target=_warm_up, name="warmup", daemon=True)
+        _thread.start()
+
+
+# =========================
+# READINESS
+# =========================
+
+def _is_loaded(name):
+    # Models loaded lazily by a request count as warm too
+    if name == "intent_model":
+        from intent_engine.app.services import intent_service
+        return intent_service.is_model_loaded()
+
+    if name == "keyword_model":
+        from extractor import is_model_loaded
+        return is_model_loaded()
+
+    with _lock:
+        return _report["components"].get(name, {}).get("loaded", False)
+
+
+def readiness():
+    components = {name: _is_loaded(name) for name, _ in COMPONENTS}
+
+    return {
+        "ready": all(components[name] for name in REQUIRED_COMPONENTS),
+        "components": components,
+        "startup": startup_report(),
+    }
+
+
+def startup_report():
+    with _lock:
+        return {
+            **_report,
+            "components": {name: dict(component) for name, component in _report["components"].items()},
+        }